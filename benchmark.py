@@ -0,0 +1,239 @@
+"""
+Benchmarks of the link/cut tree operations on different tree shapes.
+
+Run with `./run_benchmarks`, see `./run_benchmarks --help` for options.
+The results are written as JSON, and can be compared with the results of
+a previous run using `--compare`.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from link_cut_tree import (
+    ArrayLinkCutForest,
+    LinkCutForest,
+    MonoidNode,
+    NIL,
+    SUM,
+    make_node_class,
+)
+
+ENGINES = ["node", "fast", "array"]
+SHAPES = ["random", "path", "star", "caterpillar"]
+SIZES = [10**3, 10**4, 10**5, 10**6]
+OPERATIONS = ["get_root", "path_aggregate", "lca", "cut", "link", "evert"]
+
+
+def random_parents(rng, n):
+    return [NIL] + [rng.randrange(u) for u in range(1, n)]
+
+
+def path_parents(rng, n):
+    return [u - 1 for u in range(n)]
+
+
+def star_parents(rng, n):
+    return [NIL] + [0] * (n - 1)
+
+
+def caterpillar_parents(rng, n):
+    """
+    A path of `n // 2` nodes, where each of the other nodes is a leaf
+    attached to a random node on the path.
+    """
+
+    spine = max(n // 2, 1)
+    return [u - 1 for u in range(spine)] + [
+        rng.randrange(spine) for _ in range(spine, n)
+    ]
+
+
+SHAPE_PARENTS = {
+    "random": random_parents,
+    "path": path_parents,
+    "star": star_parents,
+    "caterpillar": caterpillar_parents,
+}
+
+
+def build_forest(engine, parents):
+    values = [1] * len(parents)
+    if engine == "node":
+        return LinkCutForest.from_parent_array(parents, values, MonoidNode)
+    elif engine == "fast":
+        return LinkCutForest.from_parent_array(parents, values, make_node_class("sum"))
+    else:
+        return ArrayLinkCutForest.from_parent_array(parents, values, monoid=SUM)
+
+
+def time_operation(f, args):
+    start = time.perf_counter()
+    for a in args:
+        f(*a)
+
+    return time.perf_counter() - start
+
+
+def operation_arguments(forest, arguments):
+    return {
+        "get_root": (forest.get_root, arguments["nodes"]),
+        "path_aggregate": (forest.path_aggregate, arguments["nodes"]),
+        "lca": (forest.lca, arguments["pairs"]),
+        "cut": (forest.cut, arguments["cuts"]),
+        "link": (forest.link, arguments["links"]),
+        "evert": (forest.evert, arguments["nodes"]),
+    }
+
+
+def trace_memory(engine, parents, arguments):
+    """
+    Returns the peak memory of building the forest,
+    and the peak memory allocated by each kind of operation on top of the forest.
+    """
+
+    tracemalloc.start()
+    forest = build_forest(engine, parents)
+    _, build_memory = tracemalloc.get_traced_memory()
+
+    operations = operation_arguments(forest, arguments)
+    memory = {}
+    for name in OPERATIONS:
+        f, args = operations[name]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for a in args:
+            f(*a)
+
+        _, peak = tracemalloc.get_traced_memory()
+        memory[name] = peak - current
+
+    tracemalloc.stop()
+    return build_memory, memory
+
+
+def benchmark(engine, shape, n, count, seed):
+    rng = random.Random(seed)
+    parents = SHAPE_PARENTS[shape](rng, n)
+
+    nodes = [(rng.randrange(n),) for _ in range(count)]
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(count)]
+
+    # Each cut node is linked back to its parent, restoring the tree.
+    non_roots = [u for u in range(n) if parents[u] != NIL]
+    cut_nodes = rng.sample(non_roots, min(count, len(non_roots)))
+    arguments = {
+        "nodes": nodes,
+        "pairs": pairs,
+        "cuts": [(u,) for u in cut_nodes],
+        "links": [(u, parents[u]) for u in cut_nodes],
+    }
+
+    # Tracing slows down allocations, so the memory is measured on a separate forest
+    # from the one the operations are timed on.
+    peak_memory, operation_memory = trace_memory(engine, parents, arguments)
+
+    start = time.perf_counter()
+    forest = build_forest(engine, parents)
+    build_seconds = time.perf_counter() - start
+
+    timed = operation_arguments(forest, arguments)
+    operations = {}
+    for name in OPERATIONS:
+        f, args = timed[name]
+        seconds = time_operation(f, args)
+        operations[name] = {
+            "count": len(args),
+            "seconds": seconds,
+            "ops_per_second": len(args) / seconds if seconds else None,
+            "peak_memory_bytes": operation_memory[name],
+        }
+
+    return {
+        "engine": engine,
+        "shape": shape,
+        "size": n,
+        "seed": seed,
+        "build_seconds": build_seconds,
+        "peak_memory_bytes": peak_memory,
+        "operations": operations,
+    }
+
+
+def result_key(result):
+    return (result["engine"], result["shape"], result["size"])
+
+
+def compare(results, previous, file):
+    """
+    Prints the throughput of each operation relative to `previous`.
+    """
+
+    previous = {result_key(r): r for r in previous["results"]}
+    for result in results["results"]:
+        old = previous.get(result_key(result))
+        if not old:
+            continue
+
+        engine, shape, size = result_key(result)
+        for name, op in result["operations"].items():
+            old_op = old["operations"].get(name)
+            if not old_op or not old_op["ops_per_second"] or not op["ops_per_second"]:
+                continue
+
+            ratio = op["ops_per_second"] / old_op["ops_per_second"]
+            print(f"{engine:6} {shape:12} {size:>8} {name:15} {ratio:6.2f}x", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES)
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=SHAPES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument(
+        "--count", type=int, default=10000, help="number of operations of each kind"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file to write the JSON results to")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    parser.add_argument(
+        "--quiet", action="store_true", help="don't report progress on stderr"
+    )
+    args = parser.parse_args(argv)
+
+    results = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "count": args.count,
+        "seed": args.seed,
+        "results": [],
+    }
+
+    for engine in args.engines:
+        for shape in args.shapes:
+            for n in args.sizes:
+                result = benchmark(engine, shape, n, args.count, args.seed)
+                results["results"].append(result)
+                if not args.quiet:
+                    print(f"{engine} {shape} {n} done", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f), sys.stderr)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Wrappers for sharing a forest between threads and asyncio tasks.
+
+Even queries restructure the auxiliary trees, so a forest can't be used by several threads at once.
+`SynchronizedForest` applies all operations on a single writer thread,
+which takes the operations queued by the other threads in batches and applies them with `apply_batch`.
+`AsyncForest` offers the same operations as coroutines.
+"""
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+
+from link_cut_tree import NIL, Op
+
+
+class SynchronizedForest:
+    """
+    Applies the operations on `forest` (a `LinkCutForest` or `ArrayLinkCutForest`)
+    submitted from any thread on a single writer thread.
+
+    The writer takes up to `max_batch` queued operations at a time,
+    so the throughput grows with the number of operations waiting, instead of contending for a lock on the forest.
+    The forest must not be used directly while it is wrapped.
+    Use as a context manager, or call `close` to stop the writer thread.
+    """
+
+    def __init__(self, forest, max_batch=1024):
+        self.forest = forest
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        # Guards `_closed`, so nothing is queued after the sentinel put by `close`.
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, op, u, v=NIL):
+        """
+        Queues the operation `op` (see `Op`) on the node ids `u` and `v`,
+        and returns a `concurrent.futures.Future` of its result.
+        Raises `RuntimeError` if the forest is closed.
+        """
+
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The forest is closed")
+
+            self._queue.put((op, u, v, future))
+
+        return future
+
+    def _run(self):
+        q = self._queue
+        while True:
+            item = q.get()
+            if item is None:
+                return
+
+            batch = [item]
+            closing = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    closing = True
+                    break
+
+                batch.append(item)
+
+            self._apply(
+                [item for item in batch if item[3].set_running_or_notify_cancel()]
+            )
+
+            if closing:
+                return
+
+    def _apply(self, batch):
+        """
+        Applies `batch` with `apply_batch`.
+        If an operation fails, its future gets the exception,
+        and the rest of the batch is applied after it.
+        """
+
+        while batch:
+            results = []
+            try:
+                self.forest.apply_batch(
+                    [op for op, _, _, _ in batch],
+                    [u for _, u, _, _ in batch],
+                    [v for _, _, v, _ in batch],
+                    results,
+                )
+            except Exception as e:
+                done = len(results)
+                for (_, _, _, future), result in zip(batch, results):
+                    future.set_result(result)
+
+                batch[done][3].set_exception(e)
+                batch = batch[done + 1 :]
+            else:
+                for (_, _, _, future), result in zip(batch, results):
+                    future.set_result(result)
+
+                batch = []
+
+    def close(self):
+        """
+        Applies the queued operations, and stops the writer thread.
+        """
+
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def link(self, u, v):
+        return self.submit(Op.LINK, u, v).result()
+
+    def cut(self, u):
+        return self.submit(Op.CUT, u).result()
+
+    def evert(self, u):
+        return self.submit(Op.EVERT, u).result()
+
+    def lca(self, u, v):
+        return self.submit(Op.LCA, u, v).result()
+
+    def get_root(self, u):
+        return self.submit(Op.GET_ROOT, u).result()
+
+    def path_aggregate(self, u):
+        return self.submit(Op.PATH_AGGREGATE, u).result()
+
+    def connected(self, u, v):
+        return self.submit(Op.CONNECTED, u, v).result()
+
+
+class AsyncForest:
+    """
+    Like `SynchronizedForest`, but the operations are coroutines,
+    which wait for the writer thread without blocking the event loop:
+
+        async with AsyncForest(forest) as f:
+            await f.link(1, 0)
+            root = await f.get_root(1)
+    """
+
+    def __init__(self, forest, max_batch=1024):
+        self.synchronized = SynchronizedForest(forest, max_batch)
+
+    async def submit(self, op, u, v=NIL):
+        return await asyncio.wrap_future(self.synchronized.submit(op, u, v))
+
+    async def close(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.synchronized.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def link(self, u, v):
+        return await self.submit(Op.LINK, u, v)
+
+    async def cut(self, u):
+        return await self.submit(Op.CUT, u)
+
+    async def evert(self, u):
+        return await self.submit(Op.EVERT, u)
+
+    async def lca(self, u, v):
+        return await self.submit(Op.LCA, u, v)
+
+    async def get_root(self, u):
+        return await self.submit(Op.GET_ROOT, u)
+
+    async def path_aggregate(self, u):
+        return await self.submit(Op.PATH_AGGREGATE, u)
+
+    async def connected(self, u, v):
+        return await self.submit(Op.CONNECTED, u, v)
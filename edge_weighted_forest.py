@@ -0,0 +1,109 @@
+"""
+A forest with weights on the edges instead of the nodes, see `EdgeWeightedForest`.
+"""
+
+import math
+
+from link_cut_tree import ARG_MAX, ArrayLinkCutForest
+
+
+def _edge_key(u, v):
+    return (u, v) if u < v else (v, u)
+
+
+class EdgeWeightedForest:
+    """
+    A forest on the vertices `0, ..., n - 1` with weights on the edges instead of the vertices.
+
+    Each edge is represented by an extra node of an `ArrayLinkCutForest`
+    between its two endpoints, holding the weight of the edge,
+    so the path aggregates are over the edges of the path and are unaffected by `evert`.
+    A forest on `n` vertices has at most `n - 1` edges, so the extra nodes are allocated up front.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        m = max(n - 1, 0)
+        self.forest = ArrayLinkCutForest(n + m, [-math.inf] * (n + m), monoid=ARG_MAX)
+        # The edge node of each edge, keyed by its endpoints in increasing order.
+        self.edges = {}
+        # The endpoints of each edge node, indexed by edge node - n.
+        self.endpoints = [None] * m
+        self._free = list(range(n + m - 1, n - 1, -1))
+
+    def __len__(self):
+        return self.n
+
+    def connected(self, u, v):
+        return self.forest.connected(u, v)
+
+    def has_edge(self, u, v):
+        return _edge_key(u, v) in self.edges
+
+    def weight(self, u, v):
+        """
+        Returns the weight of the edge between `u` and `v`.
+        """
+
+        return self.forest.values[self.edges[_edge_key(u, v)]]
+
+    def link(self, u, v, w):
+        """
+        Adds an edge with weight `w` between `u` and `v`.
+
+        Preconditions:
+            `u` and `v` are not in the same tree.
+        """
+
+        forest = self.forest
+        assert not forest.connected(u, v), "Can't link two vertices in the same tree"
+
+        e = self._free.pop()
+        forest.set_value(e, w)
+        self.edges[_edge_key(u, v)] = e
+        self.endpoints[e - self.n] = (u, v)
+
+        forest.evert(u)
+        forest.link(u, e)
+        forest.link(e, v)
+
+    def cut(self, u, v):
+        """
+        Removes the edge between `u` and `v` and returns its weight.
+
+        Preconditions:
+            There is an edge between `u` and `v`.
+        """
+
+        e = self.edges.pop(_edge_key(u, v), None)
+        assert e is not None, "There is no edge between u and v"
+
+        forest = self.forest
+        forest.evert(e)
+        forest.cut(u)
+        forest.cut(v)
+
+        self.endpoints[e - self.n] = None
+        self._free.append(e)
+        return forest.values[e]
+
+    def path_max_edge(self, u, v):
+        """
+        Returns the edge with the largest weight on the path between `u` and `v`
+        as a tuple `(a, b, w)` of its endpoints and weight,
+        or `None` if `u` and `v` are the same vertex.
+
+        Preconditions:
+            `u` and `v` are in the same tree.
+        """
+
+        forest = self.forest
+        assert forest.connected(u, v), "Can't query vertices in different trees"
+
+        forest.evert(u)
+        w, e = forest.path_aggregate(v)
+        if e < self.n:
+            return None
+
+        a, b = self.endpoints[e - self.n]
+        return (a, b, w)
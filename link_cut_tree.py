@@ -1,4 +1,16 @@
 import enum
+import math
+import operator
+import os
+import struct
+import sys
+import tempfile
+import textwrap
+import time
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+
+NIL = -1
 
 
 class Traversal(enum.Enum):
@@ -7,78 +19,285 @@ class Traversal(enum.Enum):
     post_order = enum.auto()
 
 
+class Op(enum.IntEnum):
+    """
+    Operation codes used by `apply_batch`.
+    The codes are stable, new operations are only ever added at the end.
+    """
+
+    LINK = 0
+    CUT = 1
+    EVERT = 2
+    LCA = 3
+    GET_ROOT = 4
+    PATH_AGGREGATE = 5
+    CONNECTED = 6
+
+
+def _value(value, key):
+    return value
+
+
+class Monoid:
+    """
+    An associative operation `combine` with an `identity` element,
+    used to aggregate the values of the nodes on a path.
+
+    `lift(value, key)` maps the value of a node to an element of the monoid,
+    where `key` is the node (or the node id in an `ArrayLinkCutForest`).
+    By default the value itself is used.
+
+    `inverse(a)` is optional, and is needed for subtree aggregates.
+
+    If `commutative` is false, the aggregate of every auxiliary subtree
+    is also maintained in reverse order, so aggregates stay correct after an evert.
+    """
+
+    __slots__ = ("identity", "combine", "lift", "inverse", "commutative")
+
+    def __init__(self, identity, combine, lift=None, inverse=None, commutative=True):
+        self.identity = identity
+        self.combine = combine
+        self.lift = _value if lift is None else lift
+        self.inverse = inverse
+        self.commutative = commutative
+
+
+def _arg_min(a, b):
+    return b if b[0] < a[0] else a
+
+
+def _arg_max(a, b):
+    return b if b[0] > a[0] else a
+
+
+def _one(value, key):
+    return 1
+
+
+def _with_key(value, key):
+    return (value, key)
+
+
+SUM = Monoid(0, operator.add, inverse=operator.neg)
+COUNT = Monoid(0, operator.add, lift=_one, inverse=operator.neg)
+MIN = Monoid(math.inf, min)
+MAX = Monoid(-math.inf, max)
+# The argument aggregates are `(value, key)` pairs,
+# preferring the node closest to the root on ties.
+# The tie-break depends on the order of the path, so they are not commutative.
+ARG_MIN = Monoid((math.inf, None), _arg_min, lift=_with_key, commutative=False)
+ARG_MAX = Monoid((-math.inf, None), _arg_max, lift=_with_key, commutative=False)
+
+
+def monoid_product(*monoids):
+    """
+    Returns a monoid aggregating tuples, where the `i`th element of the tuple
+    is aggregated using `monoids[i]`.
+    This allows several aggregates to be computed in one update.
+    """
+
+    combines = [m.combine for m in monoids]
+    lifts = [m.lift for m in monoids]
+    inverses = [m.inverse for m in monoids]
+
+    def combine(a, b):
+        return tuple(f(x, y) for f, x, y in zip(combines, a, b))
+
+    def lift(value, key):
+        return tuple(f(value, key) for f in lifts)
+
+    def inverse(a):
+        return tuple(f(x) for f, x in zip(inverses, a))
+
+    return Monoid(
+        tuple(m.identity for m in monoids),
+        combine,
+        lift,
+        inverse if all(inverses) else None,
+        all(m.commutative for m in monoids),
+    )
+
+
 class Node:
+    __slots__ = (
+        "parent",
+        "left",
+        "right",
+        "value",
+        "path_parent",
+        "reversed",
+        "augmentation",
+        "lazy",
+        "size",
+        "_neighbors",
+        "_stats",
+        "_forest",
+    )
+
     def __init__(self, value=None, left=None, right=None):
         self.parent = None
-        self.children = [None, None]
         self.value = value
         self.path_parent = None
 
         self.reversed = False
 
         self.augmentation = None
+        self.lazy = None
+        # The set of neighbors in the represented tree, if the children index is enabled.
+        self._neighbors = None
+        # The `OperationStats` of the forest of the node, if enabled.
+        self._stats = None
+        # The `LinkCutForest` to notify when the represented tree changes,
+        # once the forest has been frozen.
+        self._forest = None
 
         self.left = left
+        if left:
+            left.parent = self
+
         self.right = right
+        if right:
+            right.parent = self
 
-    def _push_reversed(self):
-        if self.parent:
-            self.parent._push_reversed()
+        self._update()
+
+    def _push_down(self):
+        """
+        Pushes the reversed flag and the pending update of `self` to its children.
+        """
 
         if self.reversed:
-            self.children = self.children[::-1]
-            for c in self.children:
-                if c:
-                    c.reversed = not c.reversed
+            l = self.left
+            r = self.right
+            self.left = r
+            self.right = l
+            if l:
+                l._flip()
+            if r:
+                r._flip()
 
             self.reversed = False
 
+        if self.lazy is not None:
+            if self.left:
+                self.left.apply_update(self.lazy)
+            if self.right:
+                self.right.apply_update(self.lazy)
+
+            self.lazy = None
+
+    def _flip(self):
+        """
+        Lazily reverses the auxiliary subtree of `self`.
+        """
+
+        self.reversed = not self.reversed
+
+    def _push_reversed(self):
+        """
+        Pushes the reversed flags and pending updates
+        on the path from the splay root to `self`, starting at the splay root.
+        """
+
+        path = []
+        n = self
+        while n:
+            path.append(n)
+            n = n.parent
+
+        for n in reversed(path):
+            n._push_down()
+
+        stats = self._stats
+        if stats is not None:
+            stats._record_splay(len(path))
+
     def __str__(self):
         return f"<{type(self).__name__}: {self.value}>"
 
+    def _update(self):
+        """
+        Updates the size and the augmentation of `self` from its children.
+        """
+
+        size = 1
+        if self.left:
+            size += self.left.size
+        if self.right:
+            size += self.right.size
+
+        self.size = size
+        self.update_augmentation()
+
     def update_augmentation(self):
         pass
 
-    def set_child(self, i, o):
-        self.children[i] = o
-        if o:
-            o.parent = self
+    def apply_update(self, op):
+        """
+        Applies the update `op` to every node in the auxiliary subtree of `self`.
 
-        self.update_augmentation()
+        Subclasses supporting `lc_path_update` must override this to update
+        `value` and `augmentation` of `self` immediately,
+        and record `op` in `lazy` (composed with any update already there),
+        which is later pushed to the children.
+        """
 
-    def child_index(self):
-        return self.parent.children.index(self)
+        raise NotImplementedError(f"{type(self).__name__} doesn't support updates")
 
     @property
-    def left(self):
-        return self.children[0]
+    def children(self):
+        return (self.left, self.right)
 
-    @left.setter
-    def left(self, o):
-        self.set_child(0, o)
+    def set_child(self, i, o):
+        """
+        Makes `o` the left (`i == 0`) or right (`i == 1`) child of `self`.
+        Assigning to `left` or `right` directly does not update `o.parent`
+        or the augmentation of `self`.
+        """
 
-    @property
-    def right(self):
-        return self.children[1]
+        if i:
+            self.right = o
+        else:
+            self.left = o
+
+        if o:
+            o.parent = self
 
-    @right.setter
-    def right(self, o):
-        self.set_child(1, o)
+        self._update()
+
+    def child_index(self):
+        return 1 if self.parent.right is self else 0
 
     def traverse_subtree(self, order=Traversal.in_order, reverse=False):
-        if order == Traversal.pre_order:
-            yield self
+        # Each stack entry is `(node, reverse, visit)`,
+        # where `visit` means that `node` should be yielded when popped.
+        stack = [(self, reverse, False)]
+        while stack:
+            node, reverse, visit = stack.pop()
+            if visit:
+                yield node
+                continue
+
+            reverse ^= node.reversed
+            if reverse:
+                first, second = node.right, node.left
+            else:
+                first, second = node.left, node.right
 
-        for i in range(2):
-            if i == 1 and order == Traversal.in_order:
-                yield self
+            if order == Traversal.pre_order:
+                yield node
+            elif order == Traversal.post_order:
+                stack.append((node, reverse, True))
 
-            c = self.children[i ^ self.reversed ^ reverse]
-            if c:
-                yield from c.traverse_subtree(order, reverse ^ self.reversed)
+            if second:
+                stack.append((second, reverse, False))
 
-        if order == Traversal.post_order:
-            yield self
+            if order == Traversal.in_order:
+                stack.append((node, reverse, True))
+
+            if first:
+                stack.append((first, reverse, False))
 
     def display_str(self):
         return str(self.value)
@@ -115,45 +334,71 @@ class Node:
         self.get_splay_root().print_subtree(file)
 
     def _rotate_up(self):
-        i = self.child_index()
+        """
+        Rotates `self` above its parent.
+        Only the augmentation of the old parent is updated,
+        the augmentation of `self` is updated once by `splay` when it is done rotating.
+        """
+
         p = self.parent
         g = p.parent
 
+        if p.left is self:
+            c = self.right
+            p.left = c
+            self.right = p
+        else:
+            c = self.left
+            p.right = c
+            self.left = p
+
+        if c:
+            c.parent = p
+
+        p.parent = self
         self.parent = g
         if g:
-            j = p.child_index()
-            g.children[j] = self
+            if g.left is p:
+                g.left = self
+            else:
+                g.right = self
         else:
             self.path_parent = p.path_parent
             p.path_parent = None
 
-        p.set_child(i, self.children[1 - i])
-        self.set_child(1 - i, p)
+        p._update()
 
     def splay(self):
         self._push_reversed()
+        if not self.parent:
+            return
+
         while self.parent:
-            i = self.child_index()
             p = self.parent
+            g = p.parent
 
-            if not p.parent:
+            if not g:
                 # zig
                 self._rotate_up()
+            elif (g.left is p) == (p.left is self):
+                # zig-zig
+                p._rotate_up()
+                self._rotate_up()
             else:
-                j = p.child_index()
-                if i == j:
-                    # zig-zig
-                    p._rotate_up()
-                    self._rotate_up()
-                else:
-                    # zig-zag
-                    self._rotate_up()
-                    self._rotate_up()
+                # zig-zag
+                self._rotate_up()
+                self._rotate_up()
+
+        self._update()
 
     def get_extreme(self, largest):
         r = self.get_splay_root()
-        while r.children[largest]:
-            r = r.children[largest]
+        r._push_down()
+        c = r.right if largest else r.left
+        while c:
+            r = c
+            r._push_down()
+            c = r.right if largest else r.left
 
         return r
 
@@ -163,6 +408,28 @@ class Node:
     def get_largest(self):
         return self.get_extreme(True)
 
+    def select(self, i):
+        """
+        Returns the `i`th (0-indexed) node in order in the splay tree containing `self`,
+        or `None` if there is no such node.
+        """
+
+        r = self.get_splay_root()
+        if not 0 <= i < r.size:
+            return None
+
+        while True:
+            r._push_down()
+            l = r.left
+            left_size = l.size if l else 0
+            if i < left_size:
+                r = l
+            elif i == left_size:
+                return r
+            else:
+                i -= left_size + 1
+                r = r.right
+
     def _lc_replace_right_subtree(self, new_right_child):
         """
         Replace the right subtree of `self` in the auxiliary tree
@@ -170,11 +437,14 @@ class Node:
         The old right subtree will become a root in its new auxiliary tree.
         """
 
+        if not self.right and not new_right_child:
+            return
+
         if self.right:
             self.right.path_parent = self
             self.right.parent = None
 
-        self.right = new_right_child
+        self.set_child(1, new_right_child)
         if new_right_child:
             new_right_child.path_parent = None
 
@@ -190,6 +460,7 @@ class Node:
         self.splay()
         self._lc_replace_right_subtree(None)
 
+        changes = 0
         while self.path_parent:
             w = self.path_parent
             w.splay()
@@ -197,6 +468,11 @@ class Node:
             w._lc_replace_right_subtree(self)
 
             self.splay()
+            changes += 1
+
+        stats = self._stats
+        if stats is not None:
+            stats._record_expose(changes)
 
     def lc_get_root(self):
         """
@@ -216,18 +492,28 @@ class Node:
             `self` is not the root of the represented tree.
 
         Returns:
-            `left`, which is the old parent of `self` in the represented tree.
+            The old parent of `self` in the represented tree.
         """
 
+        if self._forest is not None:
+            self._forest._version += 1
+
         self.lc_expose()
 
         l = self.left
         assert l != None, "Can't cut the root of the represented tree"
 
         l.parent = None
-        self.left = None
+        self.set_child(0, None)
+
+        p = l.get_largest()
+        p.splay()
 
-        return l
+        if self._neighbors is not None:
+            self._neighbors.discard(p)
+            p._neighbors.discard(self)
+
+        return p
 
     def lc_link(self, v):
         """
@@ -238,6 +524,11 @@ class Node:
             `self` is the root of its represented tree.
         """
 
+        if self._forest is not None:
+            self._forest._version += 1
+        if v._forest is not None:
+            v._forest._version += 1
+
         self.lc_expose()
         assert self.left == None, "self is not the root of the represented tree"
 
@@ -247,20 +538,163 @@ class Node:
             self.parent == None and self.path_parent == None
         ), "Can't link two nodes in the same represented tree"
 
-        self.path_parent = v
+        v._lc_add_path_child(self)
+
+        if self._neighbors is not None:
+            self._neighbors.add(v)
+            v._neighbors.add(self)
+
+    def _lc_add_path_child(self, c):
+        """
+        Makes `self` the path parent of the auxiliary tree rooted at `c`.
+        """
+
+        c.path_parent = self
 
     def lc_path_aggregate(self):
         self.lc_expose()
         return self.augmentation
 
+    def lc_path_update(self, op):
+        """
+        Applies the update `op` to every node on the path from `self`
+        to the root of the represented tree.
+        See `apply_update`.
+        """
+
+        self.lc_expose()
+        self.apply_update(op)
+
+    def lc_connected(self, v):
+        """
+        Returns whether `self` and `v` are in the same represented tree.
+        """
+
+        if self is v:
+            return True
+
+        self.lc_expose()
+        v.lc_expose()
+
+        # After exposing `v`, the auxiliary tree of `v` is the only one in its represented
+        # tree without a path parent. If `self` was in another represented tree,
+        # it is still the root of such an auxiliary tree.
+        return self.parent is not None or self.path_parent is not None
+
+    def lc_children(self):
+        """
+        Returns a list of the children of `self` in the represented tree
+        in `O(log n + d)` amortized time, where `d` is the degree of `self`.
+        Requires the children index to be enabled, see `LinkCutForest.enable_children_index`.
+
+        The index stores the neighbors of each node, which don't change on `lc_evert`,
+        and the children are the neighbors except the parent.
+        """
+
+        assert self._neighbors is not None, "The children index is not enabled"
+
+        p = self.lc_parent()
+        return [c for c in self._neighbors if c is not p]
+
+    def lc_depth(self):
+        """
+        Returns the depth of `self` in the represented tree, where the root has depth 0.
+        """
+
+        self.lc_expose()
+        return self.size - 1
+
+    def lc_kth_ancestor(self, k):
+        """
+        Returns the ancestor `k` levels above `self` in the represented tree,
+        or `None` if `self` has depth less than `k`.
+        `self.lc_kth_ancestor(0)` is `self`.
+        """
+
+        self.lc_expose()
+        a = self.select(self.size - 1 - k) if k >= 0 else None
+        if a:
+            a.splay()
+
+        return a
+
+    def lc_parent(self):
+        """
+        Returns the parent of `self` in the represented tree,
+        or `None` if `self` is the root.
+        """
+
+        return self.lc_kth_ancestor(1)
+
+    def _lc_path_below(self, w):
+        """
+        Exposes `self` and splays its ancestor `w`.
+        Returns the right child of `w`, which is the root of an auxiliary subtree containing
+        the nodes on the path from `self` to `w`, excluding `w`.
+        """
+
+        self.lc_expose()
+        w.splay()
+        return w.right
+
+    def lc_path_nodes(self, v):
+        """
+        Returns a list of the nodes on the path from `self` to `v` in the represented tree.
+
+        Preconditions:
+            `self` and `v` must be in the same represented tree.
+        """
+
+        w = self.lc_lca(v)
+
+        up = self._lc_path_below(w)
+        nodes = list(up.traverse_subtree(reverse=True)) if up else []
+        nodes.append(w)
+
+        down = v._lc_path_below(w)
+        if down:
+            nodes.extend(down.traverse_subtree())
+
+        return nodes
+
+    def lc_path_length(self, v):
+        """
+        Returns the number of edges on the path from `self` to `v` in the represented tree.
+
+        Preconditions:
+            `self` and `v` must be in the same represented tree.
+        """
+
+        w = self.lc_lca(v)
+
+        length = 0
+        for u in (self, v):
+            below = u._lc_path_below(w)
+            if below:
+                length += below.size
+
+        return length
+
+    def lc_set_value(self, value):
+        """
+        Sets the value of `self` to `value`, updating the augmentations.
+        """
+
+        self.lc_expose()
+        self.value = value
+        self.update_augmentation()
+
     def lc_evert(self):
         """
         Reverse the edges from `self` to the root of the represented tree.
         This makes `self` the new root of the represented tree.
         """
 
+        if self._forest is not None:
+            self._forest._version += 1
+
         self.lc_expose()
-        self.reversed = True
+        self._flip()
 
     def lc_lca(self, v):
         """
@@ -284,63 +718,2149 @@ class Node:
         return r.path_parent
 
 
-class LinkCutForest:
-    def __init__(self, nodes):
-        self.nodes = nodes
+class MonoidNode(Node):
+    """
+    A node with the aggregate of the values in its auxiliary subtree,
+    using the monoid in the class attribute `monoid`.
+    Use `MonoidNode.with_monoid` to create a node class for a given monoid.
+    """
 
-    def print_represented_forest(self, file=None):
-        print("digraph link_cut {", file=file)
-        for node in self.nodes:
-            print(node._node_style(), file=file)
+    __slots__ = ("reversed_augmentation",)
 
-            if node.parent:
-                continue
+    monoid = SUM
 
-            prev = None
-            for p in node.traverse_subtree(Traversal.in_order):
-                if prev:
-                    print(f"  {id(prev)} -> {id(p)};", file=file)
+    @classmethod
+    def with_monoid(cls, monoid):
+        return type(cls.__name__, (cls,), {"__slots__": (), "monoid": monoid})
 
-                prev = p
+    def update_augmentation(self):
+        monoid = self.monoid
+        combine = monoid.combine
+        l = self.left
+        r = self.right
 
-            if node.path_parent:
-                print(f"  {id(node.path_parent)} -> {id(node)};", file=file)
+        x = monoid.lift(self.value, self)
+        a = x
+        if l:
+            a = combine(l.augmentation, a)
+        if r:
+            a = combine(a, r.augmentation)
 
-        print("}", file=file)
+        self.augmentation = a
 
-    def print_aux_trees(self, file=None):
-        empty = 0
+        if not monoid.commutative:
+            a = x
+            if r:
+                a = combine(r.reversed_augmentation, a)
+            if l:
+                a = combine(a, l.reversed_augmentation)
 
-        print("digraph link_cut {", file=file)
-        for node in self.nodes:
-            print(node._node_style(), file=file)
+        self.reversed_augmentation = a
 
-            for c in node.children:
-                if c:
-                    print(f"  {id(node)} -> {id(c)};", file=file)
-                else:
-                    print(f"  {id(node)} -> empty{empty};", file=file)
-                    print(f"  empty{empty} [shape=point];", file=file)
-                    empty += 1
+    def _flip(self):
+        super()._flip()
+        self.augmentation, self.reversed_augmentation = (
+            self.reversed_augmentation,
+            self.augmentation,
+        )
 
-            if node.path_parent:
-                print(
-                    f"  {id(node.path_parent)} -> {id(node)} [style=dashed, dir=back];",
-                    file=file,
-                )
 
-        print("}", file=file)
+class SubtreeNode(MonoidNode):
+    """
+    A `MonoidNode` which also maintains the aggregate of its subtree in the represented tree.
+    `monoid` must be commutative and have an inverse.
 
+    Besides the aggregate of its auxiliary subtree, each node stores the aggregate
+    of its virtual children, which are the auxiliary trees having it as path parent.
+    """
 
-def build_link_cut_tree(structure, forest=None):
-    if not forest:
-        forest = LinkCutForest([])
+    __slots__ = ("virtual", "virtual_size", "total", "total_size")
 
-    node, children = structure
-    forest.nodes.append(node)
+    def __init__(self, value=None, left=None, right=None):
+        self.virtual = self.monoid.identity
+        self.virtual_size = 0
+        super().__init__(value, left, right)
+
+    def update_augmentation(self):
+        super().update_augmentation()
+
+        monoid = self.monoid
+        combine = monoid.combine
+        a = combine(monoid.lift(self.value, self), self.virtual)
+        size = 1 + self.virtual_size
+        for c in (self.left, self.right):
+            if c:
+                a = combine(a, c.total)
+                size += c.total_size
+
+        self.total = a
+        self.total_size = size
+
+    def _lc_add_path_child(self, c):
+        super()._lc_add_path_child(c)
+
+        self.virtual = self.monoid.combine(self.virtual, c.total)
+        self.virtual_size += c.total_size
+
+    def _lc_replace_right_subtree(self, new_right_child):
+        monoid = self.monoid
+        if self.right:
+            self.virtual = monoid.combine(self.virtual, self.right.total)
+            self.virtual_size += self.right.total_size
+
+        if new_right_child:
+            self.virtual = monoid.combine(
+                self.virtual, monoid.inverse(new_right_child.total)
+            )
+            self.virtual_size -= new_right_child.total_size
+
+        super()._lc_replace_right_subtree(new_right_child)
+
+    def lc_link(self, v):
+        super().lc_link(v)
+        v.update_augmentation()
+
+    def lc_subtree_aggregate(self):
+        """
+        Returns the aggregate of the values in the subtree of `self` in the represented tree.
+        """
+
+        self.lc_expose()
+        monoid = self.monoid
+        return monoid.combine(monoid.lift(self.value, self), self.virtual)
+
+    def lc_subtree_size(self):
+        """
+        Returns the number of nodes in the subtree of `self` in the represented tree.
+        """
+
+        self.lc_expose()
+        return 1 + self.virtual_size
+
+
+# Sources recomputing the size and augmentation of the node `{n}`
+# from its value and children, used by `make_node_class`.
+_UPDATE_SOURCES = {
+    None: """
+s = 1
+c = {n}.left
+if c is not None:
+    s += c.size
+c = {n}.right
+if c is not None:
+    s += c.size
+{n}.size = s
+""",
+    "sum": """
+a = {n}.value
+s = 1
+c = {n}.left
+if c is not None:
+    a = c.augmentation + a
+    s += c.size
+c = {n}.right
+if c is not None:
+    a = a + c.augmentation
+    s += c.size
+{n}.augmentation = a
+{n}.size = s
+""",
+    "min": """
+a = {n}.value
+s = 1
+c = {n}.left
+if c is not None:
+    if c.augmentation < a:
+        a = c.augmentation
+    s += c.size
+c = {n}.right
+if c is not None:
+    if c.augmentation < a:
+        a = c.augmentation
+    s += c.size
+{n}.augmentation = a
+{n}.size = s
+""",
+    "max": """
+a = {n}.value
+s = 1
+c = {n}.left
+if c is not None:
+    if c.augmentation > a:
+        a = c.augmentation
+    s += c.size
+c = {n}.right
+if c is not None:
+    if c.augmentation > a:
+        a = c.augmentation
+    s += c.size
+{n}.augmentation = a
+{n}.size = s
+""",
+    "size": """
+s = 1
+c = {n}.left
+if c is not None:
+    s += c.size
+c = {n}.right
+if c is not None:
+    s += c.size
+{n}.augmentation = s
+{n}.size = s
+""",
+}
+
+# Rotates `x` above its parent, updating the old parent.
+_ROTATE_SOURCE = """
+p = x.parent
+g = p.parent
+if p.left is x:
+    c = x.right
+    p.left = c
+    x.right = p
+else:
+    c = x.left
+    p.right = c
+    x.left = p
+if c is not None:
+    c.parent = p
+p.parent = x
+x.parent = g
+if g is not None:
+    if g.left is p:
+        g.left = x
+    else:
+        g.right = x
+else:
+    x.path_parent = p.path_parent
+    p.path_parent = None
+{update_p}
+"""
+
+_FAST_NODE_SOURCE = """
+def _update(self):
+    n = self
+{update_n}
+
+def update_augmentation(self):
+    n = self
+{update_n}
+
+def splay(self):
+    path = []
+    n = self
+    while n is not None:
+        path.append(n)
+        n = n.parent
+
+    for n in reversed(path):
+        if n.reversed:
+            l = n.left
+            r = n.right
+            n.left = r
+            n.right = l
+            if l is not None:
+                l.reversed = not l.reversed
+            if r is not None:
+                r.reversed = not r.reversed
+            n.reversed = False
+
+    stats = self._stats
+    if stats is not None:
+        stats._record_splay(len(path))
+
+    if self.parent is None:
+        return
+
+    while True:
+        x = self
+        y = x.parent
+        if y is None:
+            break
+
+        z = y.parent
+        if z is not None and (z.left is y) == (y.left is x):
+            x = y
+{rotate_x}
+            x = self
+{rotate_x}
+        elif z is not None:
+{rotate_x}
+{rotate_x}
+        else:
+{rotate_x}
+
+    n = self
+{update_n}
+
+def lc_expose(self):
+    self.splay()
+
+    r = self.right
+    if r is not None:
+        r.path_parent = self
+        r.parent = None
+        self.right = None
+        n = self
+{update_n_2}
+
+    changes = 0
+    while True:
+        w = self.path_parent
+        if w is None:
+            break
+
+        w.splay()
+
+        r = w.right
+        if r is not None:
+            r.path_parent = w
+            r.parent = None
+
+        # Making `self` the right child of `w` and splaying it is a single rotation,
+        # leaving the old left child of `self` as the right child of `w`.
+        c = self.left
+        w.right = c
+        if c is not None:
+            c.parent = w
+        self.left = w
+        w.parent = self
+        self.path_parent = w.path_parent
+        w.path_parent = None
+
+        n = w
+{update_n_2}
+        n = self
+{update_n_2}
+        changes += 1
+
+    stats = self._stats
+    if stats is not None:
+        stats._record_expose(changes)
+"""
+
+_node_classes = {}
+
+
+def make_node_class(augmentation=None):
+    """
+    Returns a `Node` subclass specialized for `augmentation`, which is one of:
+
+    - `None`: No augmentation.
+    - `"sum"`, `"min"`, `"max"`: The sum, minimum or maximum of the values on the path.
+    - `"size"`: The number of nodes on the path.
+
+    The rotations, the augmentation and the preferred child changes are inlined
+    in `splay` and `lc_expose`, so the `_rotate_up` and `_lc_replace_right_subtree`
+    hooks are not called, and lazy path updates are not supported.
+    The `lc_` operations otherwise behave exactly like those of `Node`.
+    """
+
+    cls = _node_classes.get(augmentation)
+    if cls is not None:
+        return cls
+
+    assert augmentation in _UPDATE_SOURCES, f"Unknown augmentation {augmentation!r}"
+
+    def indent(source, level):
+        return textwrap.indent(source.strip("\n"), "    " * level)
+
+    update = _UPDATE_SOURCES[augmentation]
+    rotate = _ROTATE_SOURCE.format(update_p=update.format(n="p"))
+    source = _FAST_NODE_SOURCE.format(
+        update_n=indent(update.format(n="n"), 1),
+        update_n_2=indent(update.format(n="n"), 2),
+        rotate_x=indent(rotate, 3),
+    )
+
+    namespace = {}
+    exec(source, namespace)
+
+    name = f"{(augmentation or 'plain').capitalize()}Node"
+    methods = {
+        method: namespace[method]
+        for method in ("_update", "update_augmentation", "splay", "lc_expose")
+    }
+    cls = type(name, (Node,), {"__slots__": (), "__module__": __name__, **methods})
+    _node_classes[augmentation] = cls
+    return cls
+
+
+def _edges_to_parents(n, edges):
+    """
+    Returns the parent array of the forest with `n` nodes and the undirected `edges`,
+    where each tree is rooted at its smallest node.
+    """
+
+    adjacent = [[] for _ in range(n)]
+    for u, v in edges:
+        adjacent[u].append(v)
+        adjacent[v].append(u)
+
+    parents = array("l", [NIL]) * n
+    visited = bytearray(n)
+    for r in range(n):
+        if visited[r]:
+            continue
+
+        visited[r] = 1
+        stack = [r]
+        while stack:
+            u = stack.pop()
+            for v in adjacent[u]:
+                if v == parents[u]:
+                    continue
+
+                assert not visited[v], "edges must not contain a cycle"
+                visited[v] = 1
+                parents[v] = u
+                stack.append(v)
+
+    return parents
+
+
+def _children_arrays(parents):
+    """
+    Returns `(start, children, roots)` for the forest given by `parents`,
+    where the children of `u` are `children[start[u]:start[u + 1]]`.
+    """
+
+    n = len(parents)
+
+    start = array("l", [0]) * (n + 1)
+    for p in parents:
+        if p >= 0:
+            start[p + 1] += 1
+    for u in range(n):
+        start[u + 1] += start[u]
+
+    children = array("l", [0]) * start[n]
+    fill = start[:n]
+    roots = array("l")
+    for u, p in enumerate(parents):
+        if p >= 0:
+            children[fill[p]] = u
+            fill[p] += 1
+        else:
+            roots.append(u)
+
+    return start, children, roots
+
+
+def _neighborhood(parents, u, depth=None):
+    """
+    Returns a list of the nodes within `depth` edges of `u` in the forest given by `parents`,
+    or the nodes in the tree of `u` if `depth` is `None`, in breadth-first order from `u`.
+    """
+
+    start, children, _ = _children_arrays(parents)
+    distance = array("l", [NIL]) * len(parents)
+    distance[u] = 0
+    nodes = [u]
+    for w in nodes:
+        d = distance[w]
+        if d == depth:
+            continue
+
+        p = parents[w]
+        for x in children[start[w] : start[w + 1]]:
+            if distance[x] == NIL:
+                distance[x] = d + 1
+                nodes.append(x)
+
+        if p >= 0 and distance[p] == NIL:
+            distance[p] = d + 1
+            nodes.append(p)
+
+    return nodes
+
+
+def _dot_escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _write_chunked(file, lines, chunk_size=4096):
+    """
+    Writes `lines` to `file`, joining `chunk_size` lines per write.
+    """
+
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == chunk_size:
+            file.write("".join(chunk))
+            chunk.clear()
+
+    file.write("".join(chunk))
 
-    for c, c_children in children:
-        c.lc_link(node)
-        build_link_cut_tree((c, c_children), forest)
+
+def _heavy_paths(parents):
+    """
+    Decomposes the forest given by `parents` into heavy paths.
+
+    Yields `(path, parent)` pairs, where `path` is a list of the nodes on a heavy path
+    ordered by depth, and `parent` is the parent of `path[0]` (or `NIL`).
+    """
+
+    n = len(parents)
+    start, children, order = _children_arrays(parents)
+
+    # Breadth-first order, so every node comes after its parent.
+    i = 0
+    while i < len(order):
+        u = order[i]
+        order.extend(children[start[u] : start[u + 1]])
+        i += 1
+
+    assert len(order) == n, "parents must not contain a cycle"
+
+    size = array("l", [1]) * n
+    heavy = array("l", [NIL]) * n
+    for u in reversed(order):
+        p = parents[u]
+        if p >= 0:
+            size[p] += size[u]
+            h = heavy[p]
+            if h == NIL or size[u] > size[h]:
+                heavy[p] = u
+
+    for u in order:
+        p = parents[u]
+        if p >= 0 and heavy[p] == u:
+            continue
+
+        path = []
+        while u != NIL:
+            path.append(u)
+            u = heavy[u]
+
+        yield path, (p if p >= 0 else NIL)
+
+
+def _build_balanced(nodes, lo, hi):
+    """
+    Builds a balanced splay tree of `nodes[lo:hi]` in order,
+    computing the augmentations bottom-up.
+    Returns the root of the tree.
+    """
+
+    if lo >= hi:
+        return None
+
+    mid = (lo + hi) // 2
+    node = nodes[mid]
+
+    l = _build_balanced(nodes, lo, mid)
+    node.left = l
+    if l:
+        l.parent = node
+
+    r = _build_balanced(nodes, mid + 1, hi)
+    node.right = r
+    if r:
+        r.parent = node
+
+    node._update()
+    return node
+
+
+# By default, every process opening a block of shared memory registers it with its resource tracker,
+# which removes the block when the process exits, even if it only attached to it.
+# Instead, shared snapshots are not tracked at all, and are only removed by `ForestSnapshot.unlink`.
+# From Python 3.13 this is done with `track=False`, before that by unregistering the block.
+_TRACK_ARGUMENT = sys.version_info >= (3, 13)
+_UNTRACK_SHARED_MEMORY = os.name == "posix" and not _TRACK_ARGUMENT
+
+
+def _open_shared_memory(name=None, size=0):
+    """
+    Creates a block of shared memory of `size` bytes if `name` is `None`,
+    or otherwise attaches to the block `name`, without tracking it in this process.
+    """
+
+    create = name is None
+    if _TRACK_ARGUMENT:
+        return shared_memory.SharedMemory(name, create, size, track=False)
+
+    shm = shared_memory.SharedMemory(name, create, size)
+    if _UNTRACK_SHARED_MEMORY:
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+    return shm
+
+
+class ForestSnapshot:
+    """
+    A read-only copy of a represented forest given by `parents`,
+    answering queries in `O(1)` time without changing any auxiliary trees.
+
+    The nodes are stored in depth-first order, where the lowest common ancestor of `u` and `v`
+    is the parent of the shallowest node after `u` up to `v` in the order,
+    which is found with a sparse table in `O(n log n)` time and space.
+
+    Since queries don't change the snapshot, it can be queried by many threads at once,
+    and by other processes after `share`.
+    """
+
+    # The arrays of a snapshot in shared memory, in order, after the number of nodes and levels.
+    _SHARED_ARRAYS = ("parents", "depths", "roots", "order", "position")
+
+    # The `SharedMemory` holding the arrays, if the snapshot is shared.
+    shared_memory = None
+
+    def __init__(self, parents):
+        n = len(parents)
+        self.parents = array("q", parents)
+        self.depths = array("q", [0]) * n
+        self.roots = array("q", [NIL]) * n
+        # The nodes in depth-first order, and the position of each node in the order.
+        self.order = array("q")
+        self.position = array("q", [0]) * n
+
+        start, children, roots = _children_arrays(self.parents)
+        depths = self.depths
+        order = self.order
+        stack = list(reversed(roots))
+        while stack:
+            u = stack.pop()
+            p = self.parents[u]
+            if p == NIL:
+                self.roots[u] = u
+            else:
+                self.roots[u] = self.roots[p]
+                depths[u] = depths[p] + 1
+
+            self.position[u] = len(order)
+            order.append(u)
+            stack.extend(children[start[u] : start[u + 1]])
+
+        assert len(order) == n, "parents must not contain a cycle"
+
+        # `table[k][i]` is the smallest key of the positions `i, ..., i + 2**k - 1`,
+        # where the key of position `i` is `depth * n + i`.
+        level = array("q", (depths[u] * n + i for i, u in enumerate(order)))
+        self.table = [level]
+        k = 1
+        while 2 * k <= n:
+            previous = level
+            level = array(
+                "q", map(min, previous[: n - 2 * k + 1], previous[k : n - k + 1])
+            )
+            self.table.append(level)
+            k *= 2
+
+    def share(self):
+        """
+        Copies the snapshot into a new block of shared memory,
+        and returns a snapshot using it, which other processes can `attach` to by its `name`.
+
+        The block is not removed automatically when the owner or any other process exits,
+        so the owner should `unlink` it when all processes are done with it.
+        """
+
+        arrays = [getattr(self, name) for name in self._SHARED_ARRAYS] + self.table
+        size = 8 * (2 + sum(len(a) for a in arrays))
+        shm = _open_shared_memory(size=size)
+
+        words = shm.buf[:size].cast("q")
+        words[0] = len(self)
+        words[1] = len(self.table)
+        i = 2
+        for a in arrays:
+            words[i : i + len(a)] = a
+            i += len(a)
+
+        words.release()
+        return ForestSnapshot._from_shared_memory(shm)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Returns the snapshot shared by `share` with the given `name`, without copying it.
+        """
+
+        return cls._from_shared_memory(_open_shared_memory(name))
+
+    @classmethod
+    def _from_shared_memory(cls, shm):
+        header = shm.buf[:16].cast("q")
+        n, levels = header
+        header.release()
+
+        lengths = [n] * len(cls._SHARED_ARRAYS) + [
+            n - (1 << k) + 1 for k in range(levels)
+        ]
+        size = 8 * (2 + sum(lengths))
+
+        snapshot = cls.__new__(cls)
+        snapshot.shared_memory = shm
+        words = shm.buf[:size].cast("q")
+        snapshot._views = [words]
+
+        views = []
+        i = 2
+        for length in lengths:
+            views.append(words[i : i + length])
+            i += length
+
+        snapshot._views.extend(views)
+        for name, view in zip(cls._SHARED_ARRAYS, views):
+            setattr(snapshot, name, view)
+
+        snapshot.table = views[len(cls._SHARED_ARRAYS) :]
+        return snapshot
+
+    @property
+    def name(self):
+        return self.shared_memory.name
+
+    def close(self):
+        """
+        Closes the shared memory of the snapshot in this process.
+        The snapshot can't be used afterwards.
+        Does nothing if the snapshot is not shared.
+        """
+
+        if self.shared_memory is None:
+            return
+
+        for view in reversed(self._views):
+            view.release()
+
+        self._views = []
+        self.shared_memory.close()
+
+    def unlink(self):
+        """
+        Closes and removes the shared memory of the snapshot.
+        """
+
+        assert self.shared_memory is not None, "The snapshot is not shared"
+
+        self.close()
+        if _UNTRACK_SHARED_MEMORY:
+            # `unlink` unregisters the block, so it must be registered again.
+            resource_tracker.register(self.shared_memory._name, "shared_memory")
+
+        self.shared_memory.unlink()
+
+    def __len__(self):
+        return len(self.parents)
+
+    def get_root(self, u):
+        return self.roots[u]
+
+    def depth(self, u):
+        return self.depths[u]
+
+    def lca(self, u, v):
+        """
+        Returns the lowest common ancestor of `u` and `v`.
+
+        Preconditions:
+            `u` and `v` must be in the same tree.
+        """
+
+        if u == v:
+            return u
+
+        assert (
+            self.roots[u] == self.roots[v]
+        ), "Can't get LCA of `u` and `v` in different trees"
+
+        a = self.position[u]
+        b = self.position[v]
+        if a > b:
+            a, b = b, a
+
+        a += 1
+        k = (b - a + 1).bit_length() - 1
+        level = self.table[k]
+        key = min(level[a], level[b - (1 << k) + 1])
+        return self.parents[self.order[key % len(self.order)]]
+
+    def lca_many(self, pairs):
+        """
+        Returns an `array` of the lowest common ancestor of each pair `(u, v)` in `pairs`.
+        """
+
+        lca = self.lca
+        return array("l", (lca(u, v) for u, v in pairs))
+
+
+# A forest file is a header, followed by the parent of each node as a little-endian int64,
+# followed by the value of each node as a little-endian int64 or float64, unless there are no values.
+# Both sections start at 8-byte aligned offsets, so they can be memory mapped.
+_FILE_MAGIC = b"LCTF"
+_FILE_VERSION = 1
+# The magic, the version, the typecode of the values (`q`, `d` or a zero byte) and the number of nodes.
+_FILE_HEADER = struct.Struct("<4sHc1xQ")
+_NO_VALUES = b"\0"
+
+
+def _value_typecode(values):
+    """
+    Returns the `array` typecode used to store `values`,
+    `q` if they are all integers, and otherwise `d`.
+    """
+
+    if values is None or all(value is None for value in values):
+        return _NO_VALUES
+
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+        return b"q"
+
+    return b"d"
+
+
+def _value_array(typecode, values):
+    """
+    Returns `values` as an `array` of `typecode`.
+    Raises `ValueError` if a value isn't an integer or a float,
+    or can't be stored exactly, so it would load back as a different value.
+    """
+
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError("Only integer and float values can be saved")
+
+        if typecode == "q":
+            exact = isinstance(value, int) and -(1 << 63) <= value < 1 << 63
+        elif isinstance(value, int):
+            try:
+                exact = float(value) == value
+            except OverflowError:
+                exact = False
+        else:
+            exact = True
+
+        if not exact:
+            raise ValueError(f"The value {value!r} can't be saved exactly")
+
+    return array(typecode, values)
+
+
+def _to_little_endian(a):
+    if sys.byteorder == "big":
+        a = array(a.typecode, a)
+        a.byteswap()
+
+    return a
+
+
+class ForestWriter:
+    """
+    Writes a forest file of `n` nodes in chunks, so the whole forest doesn't need to be in memory.
+    The parents and values are written with `write`, in order of the nodes,
+    and the file is complete once all `n` nodes have been written.
+
+    `typecode` is the `array` typecode of the values, `"q"` for integers or `"d"` for floats,
+    or `None` if the nodes have no values.
+    Use as a context manager, or call `close`.
+
+    The file is written to a temporary file next to `path`, which replaces `path` once it is complete,
+    so an existing file at `path` is kept if writing fails.
+    """
+
+    def __init__(self, path, n, typecode=None):
+        self.n = n
+        self.typecode = _NO_VALUES if typecode is None else typecode.encode()
+        assert self.typecode in (_NO_VALUES, b"q", b"d"), "Unsupported typecode"
+
+        self.path = os.fspath(path)
+        fd, self.temp_path = tempfile.mkstemp(
+            prefix=".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(self.path))
+        )
+        self.file = os.fdopen(fd, "wb")
+        self.file.write(_FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, self.typecode, n))
+        self.written = 0
+
+    def write(self, parents, values=None):
+        """
+        Writes the next `len(parents)` nodes, where `parents[i]` is the parent
+        of the node and `values[i]` is its value.
+        """
+
+        k = len(parents)
+        assert self.written + k <= self.n, "Too many nodes written"
+
+        # Both sections are converted before writing, so a failed conversion writes nothing.
+        parents = array("q", parents)
+        if self.typecode != _NO_VALUES:
+            assert (
+                values is not None and len(values) == k
+            ), "Expected one value per node"
+            values = _value_array(self.typecode.decode(), values)
+
+        f = self.file
+        f.seek(_FILE_HEADER.size + 8 * self.written)
+        f.write(_to_little_endian(parents))
+
+        if self.typecode != _NO_VALUES:
+            f.seek(_FILE_HEADER.size + 8 * (self.n + self.written))
+            f.write(_to_little_endian(values))
+
+        self.written += k
+
+    def close(self):
+        """
+        Closes the file, and replaces `path` with it if all `n` nodes have been written.
+        """
+
+        if self.file.closed:
+            return
+
+        self.file.close()
+        complete = self.written == self.n
+        if complete:
+            os.replace(self.temp_path, self.path)
+        else:
+            os.unlink(self.temp_path)
+
+        assert complete, "Not all nodes were written"
+
+    def discard(self):
+        """
+        Closes and removes the file, leaving `path` unchanged.
+        """
+
+        if not self.file.closed:
+            self.file.close()
+            os.unlink(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def write_forest(path, parents, values=None):
+    """
+    Writes a forest file with the given `parents` and `values`, see `ForestWriter`.
+    """
+
+    typecode = _value_typecode(values)
+    if typecode == _NO_VALUES:
+        typecode = values = None
+    else:
+        typecode = typecode.decode()
+
+    with ForestWriter(path, len(parents), typecode) as writer:
+        writer.write(parents, values)
+
+
+def read_forest(path):
+    """
+    Reads a forest file, and returns a tuple `(parents, values)` of `array`s,
+    where `values` is `None` if the nodes have no values.
+    """
+
+    with open(path, "rb") as f:
+        header = f.read(_FILE_HEADER.size)
+        if len(header) != _FILE_HEADER.size:
+            raise ValueError("Not a forest file")
+
+        magic, version, typecode, n = _FILE_HEADER.unpack(header)
+        if magic != _FILE_MAGIC or version != _FILE_VERSION:
+            raise ValueError("Not a forest file of a supported version")
+
+        parents = array("q")
+        parents.fromfile(f, n)
+        values = None
+        if typecode != _NO_VALUES:
+            values = array(typecode.decode())
+            values.fromfile(f, n)
+
+    if sys.byteorder == "big":
+        parents.byteswap()
+        if values is not None:
+            values.byteswap()
+
+    return parents, values
+
+
+class OperationStats:
+    """
+    Counters of the work done by the operations of a forest.
+    See `enable_stats` on the forests.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.splays = 0
+        self.rotations = 0
+        self.max_splay_depth = 0
+        self.exposes = 0
+        self.preferred_child_changes = 0
+        self.max_preferred_child_changes = 0
+        # Maps operation names to `[count, total seconds, max seconds]`.
+        self.operations = {}
+
+    def _record_splay(self, depth):
+        """
+        Records a splay of a node at `depth` in its splay tree, with the root at depth 1.
+        All the nodes on the path are pushed, and the node is rotated `depth - 1` times.
+        """
+
+        self.splays += 1
+        self.rotations += depth - 1
+        if depth > self.max_splay_depth:
+            self.max_splay_depth = depth
+
+    def _record_expose(self, changes):
+        self.exposes += 1
+        self.preferred_child_changes += changes
+        if changes > self.max_preferred_child_changes:
+            self.max_preferred_child_changes = changes
+
+    def _record_operation(self, name, seconds):
+        op = self.operations.get(name)
+        if op is None:
+            self.operations[name] = [1, seconds, seconds]
+        else:
+            op[0] += 1
+            op[1] += seconds
+            if seconds > op[2]:
+                op[2] = seconds
+
+    def snapshot(self):
+        """
+        Returns the current counters as a dictionary, which can be serialized as JSON.
+        """
+
+        return {
+            "splays": self.splays,
+            "rotations": self.rotations,
+            "rotations_per_splay": self.rotations / self.splays if self.splays else 0,
+            "max_splay_depth": self.max_splay_depth,
+            "exposes": self.exposes,
+            "preferred_child_changes": self.preferred_child_changes,
+            "preferred_child_changes_per_expose": (
+                self.preferred_child_changes / self.exposes if self.exposes else 0
+            ),
+            "max_preferred_child_changes": self.max_preferred_child_changes,
+            "operations": {
+                name: {"count": count, "seconds": seconds, "max_seconds": max_seconds}
+                for name, (count, seconds, max_seconds) in self.operations.items()
+            },
+        }
+
+
+def _timed(stats, name, f):
+    perf_counter = time.perf_counter
+
+    def timed(*args):
+        start = perf_counter()
+        try:
+            return f(*args)
+        finally:
+            stats._record_operation(name, perf_counter() - start)
+
+    return timed
+
+
+class _Forest:
+    """
+    Operations shared by `LinkCutForest` and `ArrayLinkCutForest`,
+    implemented using the methods taking node ids.
+    """
+
+    # The operations timed when stats are enabled.
+    _TIMED_OPERATIONS = (
+        "link",
+        "cut",
+        "evert",
+        "lca",
+        "get_root",
+        "path_aggregate",
+        "connected",
+    )
+
+    stats = None
+
+    # Incremented by every operation changing the represented forest,
+    # so a frozen `ForestSnapshot` can tell whether it is still up to date.
+    _version = 0
+    _snapshot = None
+    _snapshot_version = None
+
+    def enable_stats(self):
+        """
+        Starts recording `OperationStats` for this forest, and returns them.
+
+        The operations on node ids are timed by wrapping them,
+        so there is no overhead from timing when stats are disabled.
+        """
+
+        self.disable_stats()
+
+        stats = OperationStats()
+        for name in self._TIMED_OPERATIONS:
+            setattr(self, name, _timed(stats, name, getattr(self, name)))
+
+        self._set_stats(stats)
+        return stats
+
+    def disable_stats(self):
+        for name in self._TIMED_OPERATIONS:
+            self.__dict__.pop(name, None)
+
+        self._set_stats(None)
+
+    def _set_stats(self, stats):
+        self.stats = stats
+
+    def apply_batch(self, opcodes, us, vs=None, results=None):
+        """
+        Applies a batch of operations in order, and returns a list of their results.
+
+        The `i`th operation is `opcodes[i]` (see `Op`) applied to the node ids
+        `us[i]` and `vs[i]`. `vs[i]` is only used by `Op.LINK`, `Op.LCA` and `Op.CONNECTED`,
+        and `vs` can be left out if the batch contains neither.
+        Any sequences can be used, such as lists, `array`s or NumPy arrays.
+
+        The result of the `i`th operation is:
+
+        - `Op.LINK`, `Op.EVERT`: `None`
+        - `Op.CUT`: the old parent of `us[i]`
+        - `Op.LCA`: the lowest common ancestor of `us[i]` and `vs[i]`
+        - `Op.GET_ROOT`: the root of the tree containing `us[i]`
+        - `Op.PATH_AGGREGATE`: the path aggregate of `us[i]`
+        - `Op.CONNECTED`: whether `us[i]` and `vs[i]` are in the same tree
+
+        If a list `results` is given, the results are appended to it as the operations are applied,
+        so if an operation raises an exception, it holds the results of the operations before it.
+        """
+
+        n = len(opcodes)
+        assert len(us) == n, "Expected one operand per operation"
+        if vs is None:
+            vs = [NIL] * n
+        assert len(vs) == n, "Expected one operand per operation"
+
+        link = self.link
+        cut = self.cut
+        evert = self.evert
+        lca = self.lca
+        get_root = self.get_root
+        path_aggregate = self.path_aggregate
+        connected = self.connected
+
+        if results is None:
+            results = []
+
+        append = results.append
+        for i in range(n):
+            op = opcodes[i]
+            u = us[i]
+            if op == 0:
+                link(u, vs[i])
+                append(None)
+            elif op == 1:
+                append(cut(u))
+            elif op == 2:
+                evert(u)
+                append(None)
+            elif op == 3:
+                append(lca(u, vs[i]))
+            elif op == 4:
+                append(get_root(u))
+            elif op == 5:
+                append(path_aggregate(u))
+            elif op == 6:
+                append(connected(u, vs[i]))
+            else:
+                raise ValueError(f"Unknown operation code {op} at index {i}")
+
+        return results
+
+    def connected_many(self, pairs):
+        """
+        Returns a list of whether `u` and `v` are in the same represented tree
+        for each pair `(u, v)` in `pairs`.
+        """
+
+        connected = self.connected
+        return [connected(u, v) for u, v in pairs]
+
+    def freeze(self):
+        """
+        Takes a `ForestSnapshot` of the represented forest in `O(n log n)` time,
+        which is used by `lca_many` until the forest is changed.
+        Returns the snapshot.
+        """
+
+        self._snapshot = ForestSnapshot(self.parent_array())
+        self._snapshot_version = self._version
+        return self._snapshot
+
+    def save(self, path):
+        """
+        Saves the represented forest and the values of the nodes to a compact binary file,
+        see `ForestWriter`.
+        The augmentations are not saved, but recomputed in `O(n)` time by `load`.
+        """
+
+        write_forest(path, self.parent_array(), self._values())
+
+    def export(self, file=None, format="dot", node=None, depth=None, labels=False):
+        """
+        Writes the represented forest to `file` (standard output by default),
+        identifying the nodes by their ids.
+        `format` is one of:
+
+        - `"dot"`: a Graphviz digraph with an edge from each parent to its children.
+          If `labels` is true, the nodes are labelled with their values.
+        - `"edges"`: a line `u p` for each node `u` with a parent `p`.
+
+        If `node` is given, only the tree of `node` is written,
+        or if `depth` is also given, only the nodes within `depth` edges of `node`.
+        The forest is read with `parent_array` in `O(n)` time without restructuring it,
+        and the output is written in large chunks.
+        """
+
+        if file is None:
+            file = sys.stdout
+
+        parents = self.parent_array()
+        if node is None:
+            nodes = range(len(parents))
+            included = None
+        else:
+            nodes = _neighborhood(parents, node, depth)
+            included = bytearray(len(parents))
+            for u in nodes:
+                included[u] = 1
+
+        def edges():
+            for u in nodes:
+                p = parents[u]
+                if p != NIL and (included is None or included[p]):
+                    yield u, p
+
+        if format == "edges":
+            _write_chunked(file, (f"{u} {p}\n" for u, p in edges()))
+        elif format == "dot":
+            if labels:
+                values = self._values()
+                node_lines = (
+                    f'  {u} [label="{_dot_escape(values[u])}"];\n' for u in nodes
+                )
+            else:
+                node_lines = (f"  {u};\n" for u in nodes)
+
+            file.write("digraph forest {\n")
+            _write_chunked(file, node_lines)
+            _write_chunked(file, (f"  {p} -> {u};\n" for u, p in edges()))
+            file.write("}\n")
+        else:
+            raise ValueError(f"Unknown format {format}")
+
+    def lca_many(self, pairs):
+        """
+        Returns an `array` of the lowest common ancestor of each pair `(u, v)` in `pairs`.
+
+        If the forest hasn't changed since the last call to `freeze`,
+        the queries are answered by the snapshot in `O(1)` time each,
+        and otherwise by `lca`.
+        """
+
+        if self._snapshot is not None and self._snapshot_version == self._version:
+            return self._snapshot.lca_many(pairs)
+
+        lca = self.lca
+        return array("l", (lca(u, v) for u, v in pairs))
+
+
+class LinkCutForest(_Forest):
+    """
+    A forest of `nodes`.
+    Besides the `lc_` operations on the nodes themselves,
+    the forest supports operations on node ids, which are indices into `nodes`.
+    """
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self._ids = {}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _set_stats(self, stats):
+        """
+        The splay and expose counters are recorded by the nodes,
+        so each node of the forest gets a reference to the stats.
+        """
+
+        super()._set_stats(stats)
+        for node in self.nodes:
+            node._stats = stats
+
+    def node_id(self, node):
+        """
+        Returns the index of `node` in `nodes`.
+        """
+
+        ids = self._ids
+        if len(ids) != len(self.nodes):
+            ids.clear()
+            ids.update((node, i) for i, node in enumerate(self.nodes))
+
+        return ids[node]
+
+    @classmethod
+    def from_parent_array(cls, parents, values=None, node_cls=Node):
+        """
+        Builds a forest of `len(parents)` new nodes in `O(n)` time,
+        where `parents[i]` is the index of the parent of node `i`,
+        or negative if node `i` is a root.
+
+        Node `i` is created as `node_cls(values[i])`.
+        The auxiliary trees are balanced trees of the heavy paths of the forest,
+        and the nodes are not linked using `lc_link`.
+        """
+
+        n = len(parents)
+        if values is None:
+            values = [None] * n
+        assert len(values) == n, "Expected one value per node"
+
+        nodes = [node_cls(value) for value in values]
+
+        # The paths are built bottom-up, so a path is attached to its path parent
+        # before the augmentation of the path parent is computed.
+        for path, p in reversed(list(_heavy_paths(parents))):
+            r = _build_balanced([nodes[u] for u in path], 0, len(path))
+            if p != NIL:
+                nodes[p]._lc_add_path_child(r)
+
+        return cls(nodes)
+
+    @classmethod
+    def load(cls, path, node_cls=Node):
+        """
+        Loads a forest saved with `save` in `O(n)` time, see `from_parent_array`.
+        """
+
+        parents, values = read_forest(path)
+        return cls.from_parent_array(parents, values, node_cls)
+
+    def _values(self):
+        """
+        Returns the values of the nodes, after pushing the pending updates
+        of every auxiliary tree down to its nodes.
+        """
+
+        for node in self.nodes:
+            if node.parent:
+                continue
+
+            stack = [node]
+            while stack:
+                x = stack.pop()
+                x._push_down()
+                for c in x.children:
+                    if c:
+                        stack.append(c)
+
+        return [node.value for node in self.nodes]
+
+    @classmethod
+    def from_edges(cls, n, edges, values=None, node_cls=Node):
+        """
+        Like `from_parent_array`, but the forest is given by
+        undirected `edges` between the `n` nodes.
+        Each tree is rooted at its node with the smallest index.
+        """
+
+        return cls.from_parent_array(_edges_to_parents(n, edges), values, node_cls)
+
+    def get_root(self, u):
+        return self.node_id(self.nodes[u].lc_get_root())
+
+    def cut(self, u):
+        return self.node_id(self.nodes[u].lc_cut())
+
+    def link(self, u, v):
+        self.nodes[u].lc_link(self.nodes[v])
+
+    def path_aggregate(self, u):
+        return self.nodes[u].lc_path_aggregate()
+
+    def evert(self, u):
+        self.nodes[u].lc_evert()
+
+    def connected(self, u, v):
+        return self.nodes[u].lc_connected(self.nodes[v])
+
+    def path_nodes(self, u, v):
+        """
+        Returns an `array` of the ids of the nodes on the path from `u` to `v`.
+        """
+
+        nodes = self.nodes[u].lc_path_nodes(self.nodes[v])
+        return array("l", map(self.node_id, nodes))
+
+    def path_length(self, u, v):
+        return self.nodes[u].lc_path_length(self.nodes[v])
+
+    def depth(self, u):
+        return self.nodes[u].lc_depth()
+
+    def kth_ancestor(self, u, k):
+        a = self.nodes[u].lc_kth_ancestor(k)
+        return NIL if a is None else self.node_id(a)
+
+    def parent_of(self, u):
+        return self.kth_ancestor(u, 1)
+
+    def parent_array(self):
+        """
+        Returns an `array` of the parent of each node in the represented forest,
+        with `NIL` for the roots, in `O(n)` time without restructuring the auxiliary trees.
+        """
+
+        node_id = self.node_id
+        parents = array("l", [NIL]) * len(self.nodes)
+        for node in self.nodes:
+            if node.parent:
+                continue
+
+            # The path parent of an auxiliary tree is the parent of its first node.
+            prev = node.path_parent
+            for x in node.traverse_subtree():
+                if prev:
+                    parents[node_id(x)] = node_id(prev)
+
+                prev = x
+
+        return parents
+
+    def enable_children_index(self):
+        """
+        Enables `Node.lc_children` and `children` for the nodes of this forest,
+        by storing the set of neighbors of each node, maintained by `lc_link` and `lc_cut`.
+        """
+
+        nodes = self.nodes
+        for node in nodes:
+            node._neighbors = set()
+
+        for u, p in enumerate(self.parent_array()):
+            if p != NIL:
+                nodes[u]._neighbors.add(nodes[p])
+                nodes[p]._neighbors.add(nodes[u])
+
+    def children(self, u):
+        return array("l", map(self.node_id, self.nodes[u].lc_children()))
+
+    def lca(self, u, v):
+        return self.node_id(self.nodes[u].lc_lca(self.nodes[v]))
+
+    def freeze(self):
+        """
+        See `_Forest.freeze`.
+        The nodes are made to notify the forest when they are linked, cut or everted,
+        so changes made by calling `lc_` operations directly on the nodes are detected too.
+        """
+
+        for node in self.nodes:
+            node._forest = self
+
+        return super().freeze()
+
+    def print_represented_forest(self, file=None):
+        print("digraph link_cut {", file=file)
+        for node in self.nodes:
+            print(node._node_style(), file=file)
+
+            if node.parent:
+                continue
+
+            prev = None
+            for p in node.traverse_subtree(Traversal.in_order):
+                if prev:
+                    print(f"  {id(prev)} -> {id(p)};", file=file)
+
+                prev = p
+
+            if node.path_parent:
+                print(f"  {id(node.path_parent)} -> {id(node)};", file=file)
+
+        print("}", file=file)
+
+    def print_aux_trees(self, file=None):
+        empty = 0
+
+        print("digraph link_cut {", file=file)
+        for node in self.nodes:
+            print(node._node_style(), file=file)
+
+            for c in node.children:
+                if c:
+                    print(f"  {id(node)} -> {id(c)};", file=file)
+                else:
+                    print(f"  {id(node)} -> empty{empty};", file=file)
+                    print(f"  empty{empty} [shape=point];", file=file)
+                    empty += 1
+
+            if node.path_parent:
+                print(
+                    f"  {id(node.path_parent)} -> {id(node)} [style=dashed, dir=back];",
+                    file=file,
+                )
+
+        print("}", file=file)
+
+
+class ArrayLinkCutForest(_Forest):
+    """
+    A link/cut forest where the state of all nodes is stored in parallel arrays
+    indexed by integer node ids `0, ..., n - 1`.
+
+    The operations are the same as the `lc_` operations on `Node`,
+    but take node ids instead of nodes.
+    A missing node is represented by `NIL`.
+
+    If `monoid` is given, `path_aggregate(u)` returns the aggregate of the values
+    on the path from `u` to the root, see `Monoid`, and otherwise `None`.
+    `combine` is a shorthand for a commutative monoid with the operation `combine`.
+    """
+
+    def __init__(self, n, values=None, combine=None, monoid=None):
+        self.parent = array("l", [NIL]) * n
+        self.left = array("l", [NIL]) * n
+        self.right = array("l", [NIL]) * n
+        self.path_parent = array("l", [NIL]) * n
+        self.reversed = bytearray(n)
+        # The number of nodes in the auxiliary subtree of each node.
+        self.size = array("l", [1]) * n
+
+        self.values = [None] * n if values is None else list(values)
+        assert len(self.values) == n, "Expected one value per node"
+
+        if combine is not None:
+            assert monoid is None, "Only one of combine and monoid can be given"
+            monoid = Monoid(None, combine)
+
+        self.monoid = monoid
+        # Without a monoid there is nothing to aggregate, so no memory is spent on it.
+        if monoid is None:
+            self.augmentation = None
+        else:
+            lift = monoid.lift
+            self.augmentation = [lift(value, u) for u, value in enumerate(self.values)]
+
+        if monoid is None or monoid.commutative:
+            self.reversed_augmentation = None
+        else:
+            self.reversed_augmentation = list(self.augmentation)
+
+        self.stats = None
+        # The set of neighbors of each node, if the children index is enabled.
+        self._neighbors = None
+
+    @classmethod
+    def from_parent_array(cls, parents, values=None, combine=None, monoid=None):
+        """
+        Builds a forest in `O(n)` time,
+        where `parents[i]` is the parent of node `i`, or negative if node `i` is a root.
+        The auxiliary trees are balanced trees of the heavy paths of the forest.
+        """
+
+        forest = cls(len(parents), values, combine, monoid)
+        for path, p in _heavy_paths(parents):
+            r = forest._build_balanced(path, 0, len(path))
+            forest.path_parent[r] = p
+
+        return forest
+
+    @classmethod
+    def load(cls, path, combine=None, monoid=None):
+        """
+        Loads a forest saved with `save` in `O(n)` time, see `from_parent_array`.
+        """
+
+        parents, values = read_forest(path)
+        return cls.from_parent_array(parents, values, combine, monoid)
+
+    def _values(self):
+        return self.values
+
+    @classmethod
+    def from_edges(cls, n, edges, values=None, combine=None, monoid=None):
+        """
+        Like `from_parent_array`, but the forest is given by
+        undirected `edges` between the `n` nodes.
+        Each tree is rooted at its smallest node.
+        """
+
+        return cls.from_parent_array(
+            _edges_to_parents(n, edges), values, combine, monoid
+        )
+
+    def _build_balanced(self, path, lo, hi):
+        if lo >= hi:
+            return NIL
+
+        mid = (lo + hi) // 2
+        u = path[mid]
+
+        l = self._build_balanced(path, lo, mid)
+        self.left[u] = l
+        if l != NIL:
+            self.parent[l] = u
+
+        r = self._build_balanced(path, mid + 1, hi)
+        self.right[u] = r
+        if r != NIL:
+            self.parent[r] = u
+
+        self._update(u)
+        return u
+
+    def __len__(self):
+        return len(self.parent)
+
+    def _flip(self, u):
+        """
+        Lazily reverses the auxiliary subtree of `u`.
+        """
+
+        self.reversed[u] ^= 1
+
+        rev_aug = self.reversed_augmentation
+        if rev_aug is not None:
+            aug = self.augmentation
+            aug[u], rev_aug[u] = rev_aug[u], aug[u]
+
+    def _push_reversed(self, u):
+        parent = self.parent
+        path = []
+        while u != NIL:
+            path.append(u)
+            u = parent[u]
+
+        rev = self.reversed
+        for u in reversed(path):
+            if rev[u]:
+                self._push_down(u)
+
+        stats = self.stats
+        if stats is not None:
+            stats._record_splay(len(path))
+
+    def _push_down(self, u):
+        """
+        Pushes the reversed flag of `u` to its children.
+        The ancestors of `u` must not have any pending flags.
+        """
+
+        if self.reversed[u]:
+            l = self.left[u]
+            r = self.right[u]
+            self.left[u] = r
+            self.right[u] = l
+            if l != NIL:
+                self._flip(l)
+            if r != NIL:
+                self._flip(r)
+
+            self.reversed[u] = 0
+
+    def _update(self, u):
+        size = self.size
+        l = self.left[u]
+        r = self.right[u]
+
+        s = 1
+        if l != NIL:
+            s += size[l]
+        if r != NIL:
+            s += size[r]
+        size[u] = s
+
+        monoid = self.monoid
+        if monoid is None:
+            return
+
+        combine = monoid.combine
+        aug = self.augmentation
+
+        x = monoid.lift(self.values[u], u)
+        a = x
+        if l != NIL:
+            a = combine(aug[l], a)
+        if r != NIL:
+            a = combine(a, aug[r])
+
+        aug[u] = a
+
+        rev_aug = self.reversed_augmentation
+        if rev_aug is not None:
+            a = x
+            if r != NIL:
+                a = combine(rev_aug[r], a)
+            if l != NIL:
+                a = combine(a, rev_aug[l])
+
+            rev_aug[u] = a
+
+    def get_splay_root(self, u):
+        parent = self.parent
+        while parent[u] != NIL:
+            u = parent[u]
+
+        return u
+
+    def _rotate_up(self, u):
+        """
+        Rotates `u` above its parent.
+        The augmentation of `u` is not updated, this is left to `splay`.
+        """
+
+        parent = self.parent
+        left = self.left
+        right = self.right
+
+        p = parent[u]
+        g = parent[p]
+
+        if left[p] == u:
+            c = right[u]
+            left[p] = c
+            right[u] = p
+        else:
+            c = left[u]
+            right[p] = c
+            left[u] = p
+
+        if c != NIL:
+            parent[c] = p
+
+        parent[p] = u
+        parent[u] = g
+        if g != NIL:
+            if left[g] == p:
+                left[g] = u
+            else:
+                right[g] = u
+        else:
+            self.path_parent[u] = self.path_parent[p]
+            self.path_parent[p] = NIL
+
+        self._update(p)
+
+    def splay(self, u):
+        self._push_reversed(u)
+
+        parent = self.parent
+        left = self.left
+        while parent[u] != NIL:
+            p = parent[u]
+            g = parent[p]
+
+            if g == NIL:
+                # zig
+                self._rotate_up(u)
+            elif (left[g] == p) == (left[p] == u):
+                # zig-zig
+                self._rotate_up(p)
+                self._rotate_up(u)
+            else:
+                # zig-zag
+                self._rotate_up(u)
+                self._rotate_up(u)
+
+        self._update(u)
+
+    def _replace_right_subtree(self, u, c):
+        r = self.right[u]
+        if r == NIL and c == NIL:
+            return
+
+        if r != NIL:
+            self.path_parent[r] = u
+            self.parent[r] = NIL
+
+        self.right[u] = c
+        if c != NIL:
+            self.parent[c] = u
+            self.path_parent[c] = NIL
+
+        self._update(u)
+
+    def expose(self, u):
+        """
+        Makes `u` the root of its auxiliary tree,
+        which will contain exactly the nodes on the path from `u` to the root
+        of the represented tree.
+        """
+
+        self.splay(u)
+        self._replace_right_subtree(u, NIL)
+
+        changes = 0
+        path_parent = self.path_parent
+        while path_parent[u] != NIL:
+            w = path_parent[u]
+            self.splay(w)
+
+            self._replace_right_subtree(w, u)
+
+            self.splay(u)
+            changes += 1
+
+        stats = self.stats
+        if stats is not None:
+            stats._record_expose(changes)
+
+    def select(self, u, i):
+        """
+        Returns the `i`th (0-indexed) node in order in the splay tree containing `u`,
+        or `NIL` if there is no such node.
+        """
+
+        u = self.get_splay_root(u)
+        size = self.size
+        if not 0 <= i < size[u]:
+            return NIL
+
+        left = self.left
+        while True:
+            self._push_down(u)
+            l = left[u]
+            left_size = size[l] if l != NIL else 0
+            if i < left_size:
+                u = l
+            elif i == left_size:
+                return u
+            else:
+                i -= left_size + 1
+                u = self.right[u]
+
+    def depth(self, u):
+        """
+        Returns the depth of `u` in the represented tree, where the root has depth 0.
+        """
+
+        self.expose(u)
+        return self.size[u] - 1
+
+    def kth_ancestor(self, u, k):
+        """
+        Returns the ancestor `k` levels above `u` in the represented tree,
+        or `NIL` if `u` has depth less than `k`.
+        """
+
+        self.expose(u)
+        a = self.select(u, self.size[u] - 1 - k) if k >= 0 else NIL
+        if a != NIL:
+            self.splay(a)
+
+        return a
+
+    def parent_of(self, u):
+        """
+        Returns the parent of `u` in the represented tree, or `NIL` if `u` is the root.
+        """
+
+        return self.kth_ancestor(u, 1)
+
+    def parent_array(self):
+        """
+        Returns an `array` of the parent of each node in the represented forest,
+        with `NIL` for the roots, in `O(n)` time.
+        """
+
+        n = len(self)
+        parents = array("l", [NIL]) * n
+        path = array("l", [NIL]) * n
+        parent = self.parent
+        for u in range(n):
+            if parent[u] != NIL:
+                continue
+
+            # The path parent of an auxiliary tree is the parent of its first node.
+            k = self._write_subtree(u, path, 0, False)
+            parents[path[0]] = self.path_parent[u]
+            for i in range(1, k):
+                parents[path[i]] = path[i - 1]
+
+        return parents
+
+    def enable_children_index(self):
+        """
+        Enables `children`, by storing the set of neighbors of each node,
+        maintained by `link` and `cut`.
+        """
+
+        neighbors = [set() for _ in range(len(self))]
+        for u, p in enumerate(self.parent_array()):
+            if p != NIL:
+                neighbors[u].add(p)
+                neighbors[p].add(u)
+
+        self._neighbors = neighbors
+
+    def children(self, u):
+        """
+        Returns an `array` of the children of `u` in the represented tree
+        in `O(log n + d)` amortized time, where `d` is the degree of `u`.
+        Requires the children index to be enabled, see `enable_children_index`.
+        """
+
+        assert self._neighbors is not None, "The children index is not enabled"
+
+        p = self.parent_of(u)
+        return array("l", (c for c in self._neighbors[u] if c != p))
+
+    def _get_extreme(self, u, largest):
+        """
+        Returns the smallest or largest node in the splay tree rooted at `u`.
+        """
+
+        child = self.right if largest else self.left
+        while True:
+            self._push_down(u)
+            c = child[u]
+            if c == NIL:
+                return u
+
+            u = c
+
+    def get_root(self, u):
+        """
+        Returns the root of the represented tree containing `u`.
+        """
+
+        self.expose(u)
+        r = self._get_extreme(u, False)
+        self.splay(r)
+        return r
+
+    def cut(self, u):
+        """
+        Cuts `u` away from its parent in the represented tree.
+
+        Preconditions:
+            `u` is not the root of the represented tree.
+
+        Returns:
+            The old parent of `u` in the represented tree.
+        """
+
+        self._version += 1
+        self.expose(u)
+
+        l = self.left[u]
+        assert l != NIL, "Can't cut the root of the represented tree"
+
+        self.parent[l] = NIL
+        self.left[u] = NIL
+        self._update(u)
+
+        p = self._get_extreme(l, True)
+        self.splay(p)
+
+        if self._neighbors is not None:
+            self._neighbors[u].discard(p)
+            self._neighbors[p].discard(u)
+
+        return p
+
+    def link(self, u, v):
+        """
+        Links the two represented trees `u` and `v`, by making `u` a child of `v`.
+
+        Preconditions:
+            `u` and `v` are not in the same represented tree.
+            `u` is the root of its represented tree.
+        """
+
+        self._version += 1
+        self.expose(u)
+        assert self.left[u] == NIL, "u is not the root of the represented tree"
+
+        self.expose(v)
+
+        assert (
+            self.parent[u] == NIL and self.path_parent[u] == NIL
+        ), "Can't link two nodes in the same represented tree"
+
+        self.path_parent[u] = v
+
+        if self._neighbors is not None:
+            self._neighbors[u].add(v)
+            self._neighbors[v].add(u)
+
+    def path_aggregate(self, u):
+        """
+        Returns the aggregate of the values on the path from `u` to the root,
+        or `None` if the forest has no monoid, like `Node.lc_path_aggregate`.
+        """
+
+        self.expose(u)
+        if self.monoid is None:
+            return None
+
+        return self.augmentation[u]
+
+    def set_value(self, u, value):
+        """
+        Sets the value of `u` to `value`, updating the augmentations.
+        """
+
+        self.expose(u)
+        self.values[u] = value
+        self._update(u)
+
+    def connected(self, u, v):
+        """
+        Returns whether `u` and `v` are in the same represented tree.
+        """
+
+        if u == v:
+            return True
+
+        self.expose(u)
+        self.expose(v)
+
+        # See `Node.lc_connected`.
+        return self.parent[u] != NIL or self.path_parent[u] != NIL
+
+    def _path_below(self, u, w):
+        """
+        Exposes `u` and splays its ancestor `w`.
+        Returns the right child of `w`, which is the root of an auxiliary subtree containing
+        the nodes on the path from `u` to `w`, excluding `w`.
+        """
+
+        self.expose(u)
+        self.splay(w)
+        return self.right[w]
+
+    def _write_subtree(self, u, out, i, reverse):
+        """
+        Writes the nodes of the auxiliary subtree of `u` to `out` starting at index `i`,
+        in order, or in reverse order if `reverse` is true.
+        The ancestors of `u` must not have any pending flags.
+        Returns the index after the last written node.
+        """
+
+        first, second = (self.right, self.left) if reverse else (self.left, self.right)
+
+        stack = []
+        while stack or u != NIL:
+            while u != NIL:
+                self._push_down(u)
+                stack.append(u)
+                u = first[u]
+
+            u = stack.pop()
+            out[i] = u
+            i += 1
+            u = second[u]
+
+        return i
+
+    def path_nodes(self, u, v):
+        """
+        Returns an `array` of the nodes on the path from `u` to `v` in the represented tree.
+
+        Preconditions:
+            `u` and `v` must be in the same represented tree.
+        """
+
+        w = self.lca(u, v)
+        size = self.size
+
+        up = self._path_below(u, w)
+        out = array("l", [w]) * ((size[up] if up != NIL else 0) + 1)
+        self._write_subtree(up, out, 0, True)
+
+        down = self._path_below(v, w)
+        if down != NIL:
+            i = len(out)
+            out.extend(array("l", [NIL]) * size[down])
+            self._write_subtree(down, out, i, False)
+
+        return out
+
+    def path_length(self, u, v):
+        """
+        Returns the number of edges on the path from `u` to `v` in the represented tree.
+
+        Preconditions:
+            `u` and `v` must be in the same represented tree.
+        """
+
+        w = self.lca(u, v)
+
+        length = 0
+        for x in (u, v):
+            below = self._path_below(x, w)
+            if below != NIL:
+                length += self.size[below]
+
+        return length
+
+    def evert(self, u):
+        """
+        Reverse the edges from `u` to the root of the represented tree.
+        This makes `u` the new root of the represented tree.
+        """
+
+        self._version += 1
+        self.expose(u)
+        self._flip(u)
+
+    def lca(self, u, v):
+        """
+        Returns the lowest common ancestor of `u` and `v` in the represented tree.
+
+        Preconditions:
+            `u` and `v` must be in the same represented tree.
+        """
+
+        self.expose(u)
+        self.expose(v)
+
+        r = self.get_splay_root(u)
+        if r == v:
+            return u
+
+        w = self.path_parent[r]
+        assert (
+            w != NIL and self.get_splay_root(w) == v
+        ), "Can't get LCA of `u` and `v` in different represented trees"
+
+        return w
+
+
+def build_link_cut_tree(structure, forest=None):
+    if forest is None:
+        forest = LinkCutForest([])
+
+    node, children = structure
+    forest.nodes.append(node)
+
+    # Each stack entry is a node and an iterator over its remaining children.
+    stack = [(node, iter(children))]
+    while stack:
+        node, children = stack[-1]
+        for c, c_children in children:
+            c.lc_link(node)
+            forest.nodes.append(c)
+            stack.append((c, iter(c_children)))
+            break
+        else:
+            stack.pop()
 
     return forest
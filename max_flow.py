@@ -0,0 +1,189 @@
+"""
+Maximum flow with Dinic's algorithm, where each blocking flow is found
+with a link/cut forest in `O(m log n)` time, see `max_flow`.
+"""
+
+import math
+from array import array
+
+from link_cut_tree import NIL, Node
+
+
+class _FlowNode(Node):
+    """
+    The value of a node is the residual capacity of the edge to its parent
+    in the represented tree, or infinity for a root.
+    The augmentation is the minimum value on the path and a node with that value,
+    and `apply_update` adds to every value on a path.
+    """
+
+    __slots__ = ("id",)
+
+    def __init__(self, id):
+        super().__init__(math.inf)
+        self.id = id
+
+    def update_augmentation(self):
+        best = (self.value, self)
+        for c in self.children:
+            if c and c.augmentation[0] < best[0]:
+                best = c.augmentation
+
+        self.augmentation = best
+
+    def apply_update(self, op):
+        self.value += op
+
+        low, node = self.augmentation
+        self.augmentation = (low + op, node)
+
+        self.lazy = op if self.lazy is None else self.lazy + op
+
+
+def _residual_graph(n, tails, heads):
+    """
+    Returns the residual graph in compressed sparse row form as `(start, edges, targets)`,
+    where the edges going out of `v` are `edges[start[v]:start[v + 1]]`.
+    Edge `2 * i` is the `i`th given edge, and edge `2 * i + 1` is its reverse.
+    """
+
+    m = len(tails)
+    targets = array("l", [NIL]) * (2 * m)
+    start = array("l", [0]) * (n + 1)
+    for i in range(m):
+        targets[2 * i] = heads[i]
+        targets[2 * i + 1] = tails[i]
+        start[tails[i] + 1] += 1
+        start[heads[i] + 1] += 1
+
+    for v in range(n):
+        start[v + 1] += start[v]
+
+    position = array("l", start)
+    edges = array("l", [NIL]) * (2 * m)
+    for e in range(2 * m):
+        # The source of edge `e` is the target of its reverse `e ^ 1`.
+        v = targets[e ^ 1]
+        edges[position[v]] = e
+        position[v] += 1
+
+    return start, edges, targets
+
+
+def _levels(n, start, edges, targets, residual, s):
+    level = array("l", [NIL]) * n
+    level[s] = 0
+    queue = [s]
+    for v in queue:
+        for i in range(start[v], start[v + 1]):
+            e = edges[i]
+            w = targets[e]
+            if residual[e] > 0 and level[w] == NIL:
+                level[w] = level[v] + 1
+                queue.append(w)
+
+    return level
+
+
+def max_flow(n, tails, heads, capacities, s, t):
+    """
+    Computes a maximum flow from `s` to `t` in the graph on the nodes `0, ..., n - 1`,
+    where edge `i` goes from `tails[i]` to `heads[i]` with capacity `capacities[i]`.
+
+    Each phase of Dinic's algorithm finds a blocking flow in the level graph
+    by growing a forest of the current edges of the nodes, rooted where no edge has been chosen yet.
+    When `s` is in the tree of `t`, the minimum residual capacity on the path is pushed
+    with a single path update, and the saturated edges are cut.
+    This takes `O(m log n)` amortized time per phase, and there are at most `n - 1` phases.
+
+    Returns:
+        A tuple `(value, flows)` of the value of the flow and a list of the flow on each edge.
+    """
+
+    assert s != t, "The source and sink must be different"
+
+    start, edges, targets = _residual_graph(n, tails, heads)
+    residual = []
+    for c in capacities:
+        residual.append(c)
+        residual.append(0)
+
+    total = 0
+    while True:
+        level = _levels(n, start, edges, targets, residual, s)
+        if level[t] == NIL:
+            break
+
+        nodes = [_FlowNode(v) for v in range(n)]
+        # The position in `edges` of the next edge to try for each node.
+        current = array("l", start[:n])
+        # The edge from each node to its parent in the forest.
+        tree_edge = array("l", [NIL]) * n
+
+        def release(v, cut=True):
+            """
+            Records the flow pushed over the tree edge of `v`, and removes the edge.
+            """
+
+            node = nodes[v]
+            node.lc_expose()
+
+            e = tree_edge[v]
+            pushed = residual[e] - node.value
+            residual[e] -= pushed
+            residual[e ^ 1] += pushed
+            tree_edge[v] = NIL
+
+            if cut:
+                node.lc_cut()
+                node.lc_set_value(math.inf)
+
+        source = nodes[s]
+        while True:
+            r = source.lc_get_root().id
+            if r == t:
+                source.lc_expose()
+                low, _ = source.augmentation
+                source.lc_path_update(-low)
+                total += low
+
+                while True:
+                    low, node = source.augmentation
+                    if low > 0:
+                        break
+
+                    release(node.id)
+                    current[node.id] += 1
+                    source.lc_expose()
+
+                continue
+
+            end = start[r + 1]
+            while current[r] < end:
+                e = edges[current[r]]
+                w = targets[e]
+                if residual[e] > 0 and level[w] == level[r] + 1:
+                    nodes[r].lc_set_value(residual[e])
+                    nodes[r].lc_link(nodes[w])
+                    tree_edge[r] = e
+                    break
+
+                current[r] += 1
+            else:
+                if r == s:
+                    break
+
+                # `r` can't reach `t`, so it is removed from the level graph
+                # along with the edges of its children.
+                level[r] = NIL
+                for i in range(start[r], end):
+                    u = targets[edges[i]]
+                    if tree_edge[u] == edges[i] ^ 1:
+                        release(u)
+                        current[u] += 1
+
+        for v in range(n):
+            if tree_edge[v] != NIL:
+                release(v, cut=False)
+
+    return total, [residual[2 * i + 1] for i in range(len(capacities))]
@@ -0,0 +1,65 @@
+"""
+An incrementally maintained minimum spanning forest, see `MinimumSpanningForest`.
+"""
+
+from edge_weighted_forest import EdgeWeightedForest
+
+
+class MinimumSpanningForest:
+    """
+    An incrementally maintained minimum spanning forest of a graph on the vertices `0, ..., n - 1`,
+    stored in an `EdgeWeightedForest`.
+
+    Each inserted edge either links two trees, or replaces the heaviest edge
+    on the cycle it closes if it is lighter, in `O(log n)` amortized time.
+    """
+
+    def __init__(self, n):
+        self.forest = EdgeWeightedForest(n)
+        self.total_weight = 0
+
+    def __len__(self):
+        return len(self.forest)
+
+    def connected(self, u, v):
+        return self.forest.connected(u, v)
+
+    def edges(self):
+        """
+        Returns a list of the edges `(u, v, w)` of the spanning forest.
+        """
+
+        forest = self.forest
+        return [
+            (u, v, forest.weight(u, v))
+            for u, v in (e for e in forest.endpoints if e is not None)
+        ]
+
+    def insert_edge(self, u, v, w):
+        """
+        Inserts an edge with weight `w` between `u` and `v` into the graph.
+
+        Returns:
+            The edge `(a, b, w)` which is not part of the spanning forest after the insertion,
+            which is either the new edge or the edge it replaced,
+            or `None` if the new edge linked two trees.
+        """
+
+        forest = self.forest
+        if u == v:
+            return (u, v, w)
+
+        if not forest.connected(u, v):
+            forest.link(u, v, w)
+            self.total_weight += w
+            return None
+
+        heaviest = forest.path_max_edge(u, v)
+        a, b, heaviest_weight = heaviest
+        if heaviest_weight <= w:
+            return (u, v, w)
+
+        forest.cut(a, b)
+        forest.link(u, v, w)
+        self.total_weight += w - heaviest_weight
+        return heaviest
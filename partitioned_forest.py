@@ -0,0 +1,430 @@
+"""
+A forest whose represented trees are partitioned between worker processes,
+so operations on different trees are applied in parallel, see `PartitionedForest`.
+"""
+
+import heapq
+import multiprocessing
+import os
+from array import array
+
+from link_cut_tree import ArrayLinkCutForest, Monoid, NIL, Op
+
+# The operations whose result is a node id, which the shards translate back to global ids.
+_ID_RESULTS = (Op.CUT, Op.LCA, Op.GET_ROOT)
+# The operations using `vs[i]`.
+_BINARY = (Op.LINK, Op.LCA, Op.CONNECTED)
+
+
+class _Shard:
+    """
+    The trees of a shard, in a worker process.
+
+    The forest only has room for the nodes owned by the shard, which have local ids,
+    and `global_ids[i]` is the global id of local node `i`, or `NIL` if the slot is free.
+    Slots are freed when a tree is moved to another shard, and reused for trees moved to this shard,
+    and the forest is rebuilt with twice the room when there are not enough free slots.
+    """
+
+    def __init__(self, global_ids, parents, values, combine, monoid):
+        if combine is not None:
+            assert monoid is None, "Only one of combine and monoid can be given"
+            monoid = Monoid(None, combine)
+
+        self.global_ids = array("l", global_ids)
+        self.free = []
+        if monoid is not None:
+            # The keys of the monoid are the global ids, as for a single `ArrayLinkCutForest`.
+            lift = monoid.lift
+            ids = self.global_ids
+            monoid = Monoid(
+                monoid.identity,
+                monoid.combine,
+                lambda value, key: lift(value, ids[key]),
+                monoid.inverse,
+                monoid.commutative,
+            )
+
+        self.monoid = monoid
+        self.forest = ArrayLinkCutForest.from_parent_array(
+            parents, values, monoid=monoid
+        )
+        self.forest.enable_children_index()
+
+    def apply_batch(self, opcodes, us, vs, results):
+        try:
+            self.forest.apply_batch(opcodes, us, vs, results)
+        finally:
+            ids = self.global_ids
+            for i, result in enumerate(results):
+                if opcodes[i] in _ID_RESULTS:
+                    results[i] = ids[result]
+
+    def extract(self, u):
+        """
+        Removes the represented tree of the local node `u`, which must be the root,
+        and returns `(nodes, parents, values)` of its nodes in breadth-first order, using global ids.
+        """
+
+        forest = self.forest
+        assert forest.get_root(u) == u, "u is not the root of the represented tree"
+
+        nodes = [u]
+        parents = [NIL]
+        for w in nodes:
+            children = forest.children(w)
+            nodes.extend(children)
+            parents.extend([w] * len(children))
+
+        for w in reversed(nodes[1:]):
+            forest.cut(w)
+
+        ids = self.global_ids
+        values = [forest.values[w] for w in nodes]
+        result = (
+            [ids[w] for w in nodes],
+            [NIL if p == NIL else ids[p] for p in parents],
+            values,
+        )
+
+        for w in nodes:
+            ids[w] = NIL
+            self.free.append(w)
+
+        return result
+
+    def _grow(self, k):
+        """
+        Rebuilds the forest with room for at least `k` more nodes.
+        """
+
+        forest = self.forest
+        n = len(forest)
+        extra = max(n, k)
+        parents = forest.parent_array()
+        parents.extend([NIL] * extra)
+        values = list(forest.values) + [None] * extra
+
+        self.global_ids.extend([NIL] * extra)
+        self.free.extend(range(n + extra - 1, n - 1, -1))
+        self.forest = ArrayLinkCutForest.from_parent_array(
+            parents, values, monoid=self.monoid
+        )
+        self.forest.enable_children_index()
+
+    def insert(self, nodes, parents, values, v):
+        """
+        Adds a tree returned by `extract` of another shard, and links its root to the local node `v`.
+        Returns the local ids of `nodes`.
+        """
+
+        if len(self.free) < len(nodes):
+            self._grow(len(nodes) - len(self.free))
+
+        local = {}
+        for w in nodes:
+            local[w] = self.free.pop()
+            self.global_ids[local[w]] = w
+
+        forest = self.forest
+        for w, p, value in zip(nodes, parents, values):
+            forest.set_value(local[w], value)
+            if p != NIL:
+                forest.link(local[w], local[p])
+
+        forest.link(local[nodes[0]], v)
+        return [local[w] for w in nodes]
+
+
+def _serve(connection, global_ids, parents, values, combine, monoid):
+    """
+    The main loop of a worker process, owning the trees of a shard.
+    Each command is answered with a tuple `(result, exception)`.
+    """
+
+    shard = _Shard(global_ids, parents, values, combine, monoid)
+
+    while True:
+        command, args = connection.recv()
+        if command == "close":
+            connection.close()
+            return
+
+        results = []
+        try:
+            if command == "batch":
+                shard.apply_batch(*args, results)
+            elif command == "extract":
+                results = shard.extract(*args)
+            elif command == "insert":
+                results = shard.insert(*args)
+            else:
+                raise ValueError(f"Unknown command {command}")
+        except Exception as e:
+            connection.send((results, e))
+        else:
+            connection.send((results, None))
+
+
+def _partition(parents, shards):
+    """
+    Returns the shard of each node, where the trees of `parents` are assigned
+    to `shards` shards greedily by size, largest first, to balance the number of nodes.
+    """
+
+    n = len(parents)
+    roots = array("l", [NIL]) * n
+    for u in range(n):
+        path = []
+        w = u
+        while roots[w] == NIL and parents[w] >= 0:
+            assert len(path) < n, "parents must not contain a cycle"
+            path.append(w)
+            w = parents[w]
+
+        r = w if roots[w] == NIL else roots[w]
+        roots[w] = r
+        for x in path:
+            roots[x] = r
+
+    sizes = {}
+    for r in roots:
+        sizes[r] = sizes.get(r, 0) + 1
+
+    owner = {}
+    loads = [(0, s) for s in range(shards)]
+    for r in sorted(sizes, key=sizes.get, reverse=True):
+        load, s = heapq.heappop(loads)
+        owner[r] = s
+        heapq.heappush(loads, (load + sizes[r], s))
+
+    return array("l", (owner[r] for r in roots))
+
+
+class PartitionedForest:
+    """
+    A forest of the nodes `0, ..., n - 1`, where each represented tree is owned by one of
+    `shards` worker processes, each holding an `ArrayLinkCutForest`.
+
+    Operations are routed to the shard owning their nodes,
+    and `apply_batch` sends the operations of each shard to it at once, so the shards work in parallel.
+    When two trees in different shards are linked, the tree of the child is moved to the shard of the parent,
+    which takes `O(k log n)` time for a tree of `k` nodes.
+
+    Each shard only allocates room for the nodes it owns, under local ids,
+    so the memory of the forest doesn't grow with the number of shards.
+    The owner and the local id of every node are kept in this process, in two arrays of `n` integers.
+    `combine` and `monoid` are sent to the workers, so they must be picklable.
+    Use as a context manager, or call `close` to stop the workers.
+    """
+
+    def __init__(self, n, shards=None, values=None, combine=None, monoid=None):
+        self._start([NIL] * n, shards, values, combine, monoid)
+
+    @classmethod
+    def from_parent_array(
+        cls, parents, shards=None, values=None, combine=None, monoid=None
+    ):
+        """
+        Builds a forest like `ArrayLinkCutForest.from_parent_array`,
+        with the trees balanced between the shards by their number of nodes.
+        """
+
+        forest = cls.__new__(cls)
+        forest._start(parents, shards, values, combine, monoid)
+        return forest
+
+    def _start(self, parents, shards, values, combine, monoid):
+        n = len(parents)
+        if shards is None:
+            shards = os.cpu_count() or 1
+        if values is None:
+            values = [None] * n
+        assert len(values) == n, "Expected one value per node"
+
+        self.owner = _partition(parents, shards)
+        self.local = array("l", [NIL]) * n
+        local = self.local
+        owned = [[] for _ in range(shards)]
+        for u in range(n):
+            nodes = owned[self.owner[u]]
+            local[u] = len(nodes)
+            nodes.append(u)
+
+        self.connections = []
+        self.processes = []
+        for nodes in owned:
+            shard_parents = [
+                NIL if parents[u] < 0 else local[parents[u]] for u in nodes
+            ]
+            shard_values = [values[u] for u in nodes]
+
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_serve,
+                args=(
+                    worker_connection,
+                    nodes,
+                    shard_parents,
+                    shard_values,
+                    combine,
+                    monoid,
+                ),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def __len__(self):
+        return len(self.owner)
+
+    def shard_of(self, u):
+        """
+        Returns the shard owning the tree of `u`.
+        """
+
+        return self.owner[u]
+
+    def _call(self, s, command, *args):
+        self.connections[s].send((command, args))
+        result, exception = self.connections[s].recv()
+        if exception is not None:
+            raise exception
+
+        return result
+
+    def _flush(self, segment, opcodes, us, vs, results):
+        """
+        Applies the operations with the indices in `segment[s]` on each shard `s` in parallel.
+        """
+
+        local = self.local
+        shards = [s for s, indices in enumerate(segment) if indices]
+        for s in shards:
+            indices = segment[s]
+            self.connections[s].send(
+                (
+                    "batch",
+                    (
+                        [opcodes[i] for i in indices],
+                        [local[us[i]] for i in indices],
+                        [
+                            local[vs[i]] if opcodes[i] in _BINARY else NIL
+                            for i in indices
+                        ],
+                    ),
+                )
+            )
+
+        errors = []
+        for s in shards:
+            indices = segment[s]
+            shard_results, exception = self.connections[s].recv()
+            for i, result in zip(indices, shard_results):
+                results[i] = result
+
+            if exception is not None:
+                errors.append((indices[len(shard_results)], exception))
+
+            segment[s] = []
+
+        if errors:
+            raise min(errors, key=lambda e: e[0])[1]
+
+    def _link_across(self, u, v):
+        a = self.owner[u]
+        b = self.owner[v]
+        nodes, parents, values = self._call(a, "extract", self.local[u])
+        local = self._call(b, "insert", nodes, parents, values, self.local[v])
+        for w, i in zip(nodes, local):
+            self.owner[w] = b
+            self.local[w] = i
+
+    def apply_batch(self, opcodes, us, vs=None):
+        """
+        Like `ArrayLinkCutForest.apply_batch`.
+
+        The operations are applied in parallel on the shards,
+        up to each link between trees of different shards.
+        If an operation raises an exception, the operations before it have been applied,
+        and operations after it on other shards may also have been applied.
+        """
+
+        n = len(opcodes)
+        assert len(us) == n, "Expected one operand per operation"
+        if vs is None:
+            vs = [NIL] * n
+        assert len(vs) == n, "Expected one operand per operation"
+
+        owner = self.owner
+        results = [None] * n
+        segment = [[] for _ in self.connections]
+        for i in range(n):
+            op = opcodes[i]
+            s = owner[us[i]]
+            if op in (Op.LINK, Op.LCA, Op.CONNECTED) and owner[vs[i]] != s:
+                if op == Op.CONNECTED:
+                    results[i] = False
+                    continue
+
+                self._flush(segment, opcodes, us, vs, results)
+                assert (
+                    op == Op.LINK
+                ), "Can't get LCA of `u` and `v` in different represented trees"
+                self._link_across(us[i], vs[i])
+                continue
+
+            segment[s].append(i)
+
+        self._flush(segment, opcodes, us, vs, results)
+        return results
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+
+        for connection in self.connections:
+            connection.send(("close", ()))
+            connection.close()
+
+        for process in self.processes:
+            process.join()
+
+        self.connections = []
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def link(self, u, v):
+        return self.apply_batch([Op.LINK], [u], [v])[0]
+
+    def cut(self, u):
+        return self.apply_batch([Op.CUT], [u])[0]
+
+    def evert(self, u):
+        return self.apply_batch([Op.EVERT], [u])[0]
+
+    def lca(self, u, v):
+        return self.apply_batch([Op.LCA], [u], [v])[0]
+
+    def get_root(self, u):
+        return self.apply_batch([Op.GET_ROOT], [u])[0]
+
+    def path_aggregate(self, u):
+        return self.apply_batch([Op.PATH_AGGREGATE], [u])[0]
+
+    def connected(self, u, v):
+        return self.apply_batch([Op.CONNECTED], [u], [v])[0]
+
+    def connected_many(self, pairs):
+        return self.apply_batch(
+            [Op.CONNECTED] * len(pairs), [u for u, _ in pairs], [v for _, v in pairs]
+        )
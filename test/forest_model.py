@@ -0,0 +1,210 @@
+"""
+Helpers shared by the tests: a naive parent array model of a represented forest,
+random operations on it, which the randomized tests apply to the link/cut trees
+and compare against, and node classes used by several tests.
+"""
+
+import itertools
+from array import array
+
+from link_cut_tree import NIL, Node, Op
+
+
+class ForestModel:
+    def __init__(self, n=0, parents=None):
+        self.parents = [NIL] * n if parents is None else list(parents)
+
+    def __len__(self):
+        return len(self.parents)
+
+    def root_path(self, u):
+        """
+        Returns the list of nodes from `u` up to the root of its tree.
+        """
+
+        parents = self.parents
+        path = [u]
+        while parents[u] != NIL:
+            u = parents[u]
+            path.append(u)
+
+        return path
+
+    def root(self, u):
+        return self.root_path(u)[-1]
+
+    def connected(self, u, v):
+        return self.root(u) == self.root(v)
+
+    def depth(self, u):
+        return len(self.root_path(u)) - 1
+
+    def lca(self, u, v):
+        """
+        Returns the lowest common ancestor of `u` and `v`, or `None` if they aren't connected.
+        """
+
+        path = set(self.root_path(u))
+        w = self.root_path(v)
+        return next((x for x in w if x in path), None)
+
+    def path(self, u, v):
+        """
+        Returns the list of nodes on the path from `u` to `v`, or `None` if they aren't connected.
+        """
+
+        up = self.root_path(u)
+        down = self.root_path(v)
+        if up[-1] != down[-1]:
+            return None
+
+        while len(up) > 1 and len(down) > 1 and up[-2] == down[-2]:
+            up.pop()
+            down.pop()
+
+        return up + down[-2::-1]
+
+    def children(self, u):
+        return [w for w, p in enumerate(self.parents) if p == u]
+
+    def subtree(self, u):
+        nodes = [u]
+        for w in nodes:
+            nodes.extend(self.children(w))
+
+        return nodes
+
+    def evert(self, u):
+        prev = NIL
+        for w in self.root_path(u):
+            self.parents[w], prev = prev, w
+
+    def link(self, u, v):
+        assert self.parents[u] == NIL and not self.connected(u, v)
+        self.parents[u] = v
+
+    def cut(self, u):
+        p = self.parents[u]
+        self.parents[u] = NIL
+        return p
+
+
+def random_operations(rng, model, count=None, queries=1):
+    """
+    Yields `count` (or infinitely many) random steps on `model` as tuples `(op, u, v)`,
+    each after applying it to the model:
+
+    - `(Op.EVERT, u, NIL)` followed by `(Op.LINK, u, v)` for two nodes in different trees,
+    - `(Op.CUT, u, p)`, where `p` was the parent of `u`,
+    - `(Op.EVERT, u, NIL)`,
+    - `(None, u, v)` for a query of two random nodes, which is left to the caller.
+
+    Queries are chosen `queries` times as often as each kind of change,
+    and changes which aren't possible are skipped.
+    """
+
+    n = len(model)
+    steps = itertools.count() if count is None else range(count)
+    for _ in steps:
+        u = rng.randrange(n)
+        v = rng.randrange(n)
+        op = rng.randrange(3 + queries)
+        if op == 0:
+            if not model.connected(u, v):
+                model.evert(u)
+                yield Op.EVERT, u, NIL
+                model.link(u, v)
+                yield Op.LINK, u, v
+        elif op == 1:
+            if model.parents[u] != NIL:
+                yield Op.CUT, u, model.cut(u)
+        elif op == 2:
+            model.evert(u)
+            yield Op.EVERT, u, NIL
+        else:
+            yield None, u, v
+
+
+def apply_change(forest, op, u, v):
+    """
+    Applies a change yielded by `random_operations` to a forest taking node ids,
+    and returns its result.
+    """
+
+    if op == Op.LINK:
+        return forest.link(u, v)
+    elif op == Op.CUT:
+        return forest.cut(u)
+    else:
+        return forest.evert(u)
+
+
+def random_batch(rng, n, size):
+    """
+    Returns a random valid batch of operations on a forest of `n` isolated nodes,
+    along with the expected results.
+    """
+
+    model = ForestModel(n)
+    opcodes = array("b")
+    us = array("l")
+    vs = array("l")
+    expected = []
+
+    def add(op, u, v=NIL, result=None):
+        opcodes.append(op)
+        us.append(u)
+        vs.append(v)
+        expected.append(result)
+
+    for op, u, v in random_operations(rng, model, queries=4):
+        if len(opcodes) >= size:
+            break
+
+        if op == Op.LINK:
+            add(op, u, v)
+        elif op is not None:
+            # `random_operations` yields the old parent as `v` of a cut.
+            add(op, u, result=v if op == Op.CUT else None)
+        else:
+            op = rng.choice([Op.LCA, Op.GET_ROOT, Op.PATH_AGGREGATE, Op.CONNECTED])
+            if op == Op.LCA and model.connected(u, v):
+                add(Op.LCA, u, v, model.lca(u, v))
+            elif op == Op.GET_ROOT:
+                add(Op.GET_ROOT, u, result=model.root(u))
+            elif op == Op.PATH_AGGREGATE:
+                add(Op.PATH_AGGREGATE, u, result=sum(model.root_path(u)))
+            elif op == Op.CONNECTED:
+                add(Op.CONNECTED, u, v, model.connected(u, v))
+
+    return opcodes, us, vs, expected
+
+
+class PathAddNode(Node):
+    """
+    Supports adding a value to every node on a path,
+    with the minimum and sum of the path as augmentation.
+    """
+
+    def __init__(self, value):
+        self.size = 1
+        super().__init__(value)
+
+    def update_augmentation(self):
+        self.size = 1
+        low = total = self.value
+        for c in self.children:
+            if c:
+                self.size += c.size
+                low = min(low, c.augmentation[0])
+                total += c.augmentation[1]
+
+        self.augmentation = (low, total)
+
+    def apply_update(self, op):
+        self.value += op
+
+        low, total = self.augmentation
+        self.augmentation = (low + op, total + op * self.size)
+
+        self.lazy = op if self.lazy is None else self.lazy + op
@@ -0,0 +1,73 @@
+import random
+import unittest
+
+from link_cut_tree import (
+    ArrayLinkCutForest,
+    LinkCutForest,
+    NIL,
+    Node,
+    build_link_cut_tree,
+    make_node_class,
+)
+from test.forest_model import ForestModel, apply_change, random_operations
+
+
+class TestAncestors(unittest.TestCase):
+    def test_nodes(self):
+        nodes = {c: Node(c) for c in "abcdefg"}
+        build_link_cut_tree(
+            (
+                nodes["a"],
+                [
+                    (nodes["b"], [(nodes["d"], [(nodes["g"], [])]), (nodes["e"], [])]),
+                    (nodes["c"], [(nodes["f"], [])]),
+                ],
+            )
+        )
+
+        self.assertEqual(nodes["g"].lc_depth(), 3)
+        self.assertEqual(nodes["a"].lc_depth(), 0)
+        self.assertIs(nodes["g"].lc_parent(), nodes["d"])
+        self.assertIsNone(nodes["a"].lc_parent())
+        self.assertIs(nodes["g"].lc_kth_ancestor(0), nodes["g"])
+        self.assertIs(nodes["g"].lc_kth_ancestor(2), nodes["b"])
+        self.assertIs(nodes["g"].lc_kth_ancestor(3), nodes["a"])
+        self.assertIsNone(nodes["g"].lc_kth_ancestor(4))
+        self.assertIsNone(nodes["g"].lc_kth_ancestor(-1))
+
+        nodes["f"].lc_evert()
+        self.assertEqual(nodes["g"].lc_depth(), 5)
+        self.assertIs(nodes["a"].lc_parent(), nodes["c"])
+        self.assertIs(nodes["g"].lc_kth_ancestor(4), nodes["c"])
+        self.assertIs(nodes["g"].lc_kth_ancestor(5), nodes["f"])
+
+    def run_random(self, forest):
+        rng = random.Random(15)
+        model = ForestModel(len(forest))
+
+        for op, u, v in random_operations(rng, model, 3000, queries=2):
+            if op is not None:
+                apply_change(forest, op, u, v)
+                continue
+
+            path = model.root_path(u)
+            self.assertEqual(forest.depth(u), len(path) - 1)
+            self.assertEqual(forest.parent_of(u), model.parents[u])
+
+            k = rng.randrange(len(path) + 1)
+            expected = path[k] if k < len(path) else NIL
+            self.assertEqual(forest.kth_ancestor(u, k), expected)
+
+    def test_random_array(self):
+        self.run_random(ArrayLinkCutForest(30))
+
+    def test_random_nodes(self):
+        self.run_random(LinkCutForest.from_parent_array([NIL] * 30))
+
+    def test_random_fast_nodes(self):
+        forest = LinkCutForest.from_parent_array([NIL] * 30, node_cls=make_node_class())
+        self.run_random(forest)
+
+
+if __name__ == "__main__":
+    unittest.main()
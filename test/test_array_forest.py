@@ -0,0 +1,103 @@
+import operator
+import random
+import unittest
+
+from link_cut_tree import ArrayLinkCutForest, Op
+from test.forest_model import ForestModel, apply_change, random_operations
+
+NAMES = "abcdefghijkl"
+EDGES = [
+    ("b", "a"),
+    ("c", "a"),
+    ("d", "a"),
+    ("e", "b"),
+    ("f", "b"),
+    ("h", "e"),
+    ("g", "d"),
+    ("i", "g"),
+    ("j", "g"),
+    ("k", "g"),
+    ("l", "j"),
+]
+
+
+def build_forest(**kwargs):
+    forest = ArrayLinkCutForest(len(NAMES), **kwargs)
+    for u, v in EDGES:
+        forest.link(NAMES.index(u), NAMES.index(v))
+
+    return forest
+
+
+class TestArrayForest(unittest.TestCase):
+    def test_path_sum(self):
+        forest = build_forest(values=[1 << i for i in range(12)], combine=operator.add)
+        v = lambda c: 1 << NAMES.index(c)
+        i = NAMES.index
+
+        self.assertEqual(forest.path_aggregate(i("a")), v("a"))
+        self.assertEqual(
+            forest.path_aggregate(i("h")), v("a") + v("b") + v("e") + v("h")
+        )
+        self.assertEqual(
+            forest.path_aggregate(i("l")), v("a") + v("d") + v("g") + v("j") + v("l")
+        )
+
+        self.assertEqual(forest.cut(i("g")), i("d"))
+        self.assertEqual(forest.path_aggregate(i("l")), v("g") + v("j") + v("l"))
+        self.assertEqual(forest.get_root(i("l")), i("g"))
+
+        forest.link(i("g"), i("c"))
+        self.assertEqual(
+            forest.path_aggregate(i("k")), v("a") + v("c") + v("g") + v("k")
+        )
+        self.assertEqual(forest.get_root(i("k")), i("a"))
+
+    def test_evert(self):
+        forest = build_forest(values=[1] * 12, combine=operator.add)
+
+        forest.evert(NAMES.index("j"))
+
+        self.assertEqual(forest.path_aggregate(NAMES.index("l")), 2)
+        self.assertEqual(forest.path_aggregate(NAMES.index("h")), 7)
+        self.assertEqual(forest.get_root(NAMES.index("h")), NAMES.index("j"))
+
+    def test_lca(self):
+        forest = build_forest()
+        lca = lambda u, v: NAMES[forest.lca(NAMES.index(u), NAMES.index(v))]
+
+        self.assertEqual(lca("a", "f"), "a")
+        self.assertEqual(lca("f", "a"), "a")
+        self.assertEqual(lca("j", "i"), "g")
+        self.assertEqual(lca("h", "k"), "a")
+        self.assertEqual(lca("h", "f"), "b")
+
+    def test_no_monoid(self):
+        forest = build_forest(values=range(12))
+        self.assertIsNone(forest.augmentation)
+        self.assertIsNone(forest.path_aggregate(NAMES.index("l")))
+
+        forest.set_value(NAMES.index("l"), 42)
+        self.assertEqual(forest.values[NAMES.index("l")], 42)
+        self.assertIsNone(forest.path_aggregate(NAMES.index("l")))
+
+    def test_random(self):
+        rng = random.Random(1)
+        n = 50
+        values = [rng.randrange(100) for _ in range(n)]
+        forest = ArrayLinkCutForest(n, values, combine=operator.add)
+        model = ForestModel(n)
+
+        for op, u, v in random_operations(rng, model, 2000):
+            if op == Op.CUT:
+                self.assertEqual(forest.cut(u), v)
+            elif op is not None:
+                apply_change(forest, op, u, v)
+            else:
+                path = model.root_path(u)
+                self.assertEqual(forest.get_root(u), path[-1])
+                self.assertEqual(forest.path_aggregate(u), sum(values[w] for w in path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import random
+import unittest
+
+from link_cut_tree import (
+    ArrayLinkCutForest,
+    LinkCutForest,
+    MonoidNode,
+    NIL,
+    Op,
+    SUM,
+)
+from test.forest_model import random_batch
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.n = 40
+        self.batch = random_batch(random.Random(8), self.n, 3000)
+
+    def test_array(self):
+        forest = ArrayLinkCutForest(self.n, range(self.n), monoid=SUM)
+        opcodes, us, vs, expected = self.batch
+        self.assertEqual(forest.apply_batch(opcodes, us, vs), expected)
+
+    def test_nodes(self):
+        forest = LinkCutForest.from_parent_array(
+            [NIL] * self.n, range(self.n), MonoidNode
+        )
+        opcodes, us, vs, expected = self.batch
+        self.assertEqual(forest.apply_batch(opcodes, us, vs), expected)
+
+    def test_unary(self):
+        forest = ArrayLinkCutForest.from_parent_array([NIL, 0, 1])
+        self.assertEqual(
+            forest.apply_batch([Op.GET_ROOT, Op.EVERT, Op.GET_ROOT], [2, 2, 0]),
+            [0, None, 2],
+        )
+
+    def test_connected_many(self):
+        forest = ArrayLinkCutForest.from_parent_array([NIL, 0, 1, NIL, 3])
+        pairs = [(0, 2), (2, 1), (4, 3), (1, 4), (3, 3)]
+        expected = [True, True, True, False, True]
+        self.assertEqual(forest.connected_many(pairs), expected)
+
+        forest = LinkCutForest.from_parent_array([NIL, 0, 1, NIL, 3])
+        self.assertEqual(forest.connected_many(pairs), expected)
+
+    def test_unknown(self):
+        forest = ArrayLinkCutForest(1)
+        with self.assertRaises(ValueError):
+            forest.apply_batch([42], [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import json
+import os
+import tempfile
+import unittest
+
+import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_smoke(self):
+        with tempfile.TemporaryDirectory() as d:
+            output = os.path.join(d, "results.json")
+            results = benchmark.main(
+                ["--sizes", "50", "--count", "20", "--output", output, "--quiet"]
+            )
+
+            with open(output) as f:
+                self.assertEqual(json.load(f), results)
+
+        self.assertEqual(
+            len(results["results"]), len(benchmark.ENGINES) * len(benchmark.SHAPES)
+        )
+        for result in results["results"]:
+            self.assertEqual(set(result["operations"]), set(benchmark.OPERATIONS))
+            for op in result["operations"].values():
+                self.assertGreaterEqual(op["peak_memory_bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import operator
+import random
+import unittest
+
+from link_cut_tree import ArrayLinkCutForest, LinkCutForest, NIL, Node
+from test.forest_model import ForestModel
+
+
+class PathSumNode(Node):
+    def update_augmentation(self):
+        self.augmentation = self.value
+        for c in self.children:
+            if c:
+                self.augmentation += c.augmentation
+
+
+def random_parents(rng, n):
+    parents = [NIL] * n
+    for u in range(1, n):
+        if rng.random() < 0.9:
+            parents[u] = rng.randrange(u)
+
+    order = list(range(n))
+    rng.shuffle(order)
+    relabel = {u: i for i, u in enumerate(order)}
+
+    shuffled = [NIL] * n
+    for u, p in enumerate(parents):
+        shuffled[relabel[u]] = NIL if p == NIL else relabel[p]
+
+    return shuffled
+
+
+class TestFromParentArray(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(4)
+        self.n = 300
+        self.parents = random_parents(rng, self.n)
+        self.values = [rng.randrange(1000) for _ in range(self.n)]
+
+    def check(self, get_root, path_aggregate):
+        model = ForestModel(parents=self.parents)
+        for u in range(self.n):
+            path = model.root_path(u)
+            self.assertEqual(get_root(u), path[-1])
+            self.assertEqual(path_aggregate(u), sum(self.values[w] for w in path))
+
+    def test_nodes(self):
+        forest = LinkCutForest.from_parent_array(
+            self.parents, self.values, node_cls=PathSumNode
+        )
+        nodes = forest.nodes
+        self.assertEqual([node.value for node in nodes], self.values)
+
+        self.check(
+            lambda u: nodes.index(nodes[u].lc_get_root()),
+            lambda u: nodes[u].lc_path_aggregate(),
+        )
+
+    def test_array(self):
+        forest = ArrayLinkCutForest.from_parent_array(
+            self.parents, self.values, combine=operator.add
+        )
+        self.check(forest.get_root, forest.path_aggregate)
+
+    def test_path(self):
+        n = 100000
+        forest = ArrayLinkCutForest.from_parent_array(
+            [i - 1 for i in range(n)], [1] * n, combine=operator.add
+        )
+
+        self.assertEqual(forest.path_aggregate(n - 1), n)
+        self.assertEqual(forest.get_root(n // 2), 0)
+
+    def test_cycle(self):
+        with self.assertRaises(AssertionError):
+            LinkCutForest.from_parent_array([1, 2, 0, NIL])
+
+
+class TestFromEdges(unittest.TestCase):
+    def test_from_edges(self):
+        edges = [(3, 1), (1, 0), (4, 1), (5, 2)]
+        forest = ArrayLinkCutForest.from_edges(6, edges, [1] * 6, combine=operator.add)
+
+        self.assertEqual(forest.get_root(4), 0)
+        self.assertEqual(forest.path_aggregate(4), 3)
+        self.assertEqual(forest.get_root(5), 2)
+        self.assertEqual(forest.lca(3, 4), 1)
+
+        forest = LinkCutForest.from_edges(6, edges)
+        nodes = forest.nodes
+        self.assertIs(nodes[3].lc_lca(nodes[4]), nodes[1])
+
+    def test_cycle(self):
+        with self.assertRaises(AssertionError):
+            LinkCutForest.from_edges(3, [(0, 1), (1, 2), (2, 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
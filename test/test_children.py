@@ -0,0 +1,56 @@
+import random
+import unittest
+
+from link_cut_tree import ArrayLinkCutForest, LinkCutForest, NIL
+from test.forest_model import ForestModel, apply_change, random_operations
+
+
+class TestChildren(unittest.TestCase):
+    def test_nodes(self):
+        parents = [NIL, 0, 0, 1, 1, 2, NIL, 6]
+        forest = LinkCutForest.from_parent_array(parents)
+        self.assertEqual(list(forest.parent_array()), parents)
+
+        forest.enable_children_index()
+        nodes = forest.nodes
+        self.assertEqual(set(nodes[0].lc_children()), {nodes[1], nodes[2]})
+        self.assertEqual(nodes[3].lc_children(), [])
+
+        nodes[3].lc_evert()
+        self.assertEqual(nodes[3].lc_children(), [nodes[1]])
+        self.assertEqual(set(nodes[1].lc_children()), {nodes[0], nodes[4]})
+        self.assertEqual(nodes[0].lc_children(), [nodes[2]])
+
+        nodes[0].lc_cut()
+        self.assertEqual(nodes[1].lc_children(), [nodes[4]])
+        nodes[0].lc_link(nodes[7])
+        self.assertEqual(nodes[7].lc_children(), [nodes[0]])
+        self.assertEqual(list(forest.children(6)), [7])
+
+    def test_disabled(self):
+        forest = ArrayLinkCutForest.from_parent_array([NIL, 0])
+        with self.assertRaises(AssertionError):
+            forest.children(0)
+
+    def run_random(self, forest):
+        rng = random.Random(16)
+        model = ForestModel(len(forest))
+        forest.enable_children_index()
+
+        for op, u, v in random_operations(rng, model, 3000):
+            if op is not None:
+                apply_change(forest, op, u, v)
+                continue
+
+            self.assertEqual(sorted(forest.children(u)), model.children(u))
+            self.assertEqual(list(forest.parent_array()), model.parents)
+
+    def test_random_array(self):
+        self.run_random(ArrayLinkCutForest(30))
+
+    def test_random_nodes(self):
+        self.run_random(LinkCutForest.from_parent_array([NIL] * 30))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import random
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from concurrent_forest import AsyncForest, SynchronizedForest
+from link_cut_tree import ArrayLinkCutForest, LinkCutForest, NIL, Op, SUM
+
+
+class TestSynchronizedForest(unittest.TestCase):
+    def test_threads(self):
+        n = 1000
+        rng = random.Random(25)
+        parents = [NIL] + [rng.randrange(u) for u in range(1, n)]
+        forest = ArrayLinkCutForest.from_parent_array(parents, [1] * n, monoid=SUM)
+        depths = [0] * n
+        for u in range(1, n):
+            depths[u] = depths[parents[u]] + 1
+
+        with SynchronizedForest(forest, max_batch=64) as synchronized:
+
+            def check(u):
+                return (
+                    synchronized.get_root(u) == 0
+                    and synchronized.path_aggregate(u) == depths[u] + 1
+                )
+
+            with ThreadPoolExecutor(8) as executor:
+                self.assertTrue(all(executor.map(check, range(n))))
+
+    def test_errors(self):
+        forest = LinkCutForest.from_parent_array([NIL, 0, NIL])
+        with SynchronizedForest(forest) as synchronized:
+            futures = [
+                synchronized.submit(op, u, v)
+                for op, u, v in [(4, 1, NIL), (1, 0, NIL), (0, 2, 1), (4, 2, NIL)]
+            ]
+
+            self.assertEqual(futures[0].result(), 0)
+            with self.assertRaises(AssertionError):
+                futures[1].result()
+
+            self.assertIsNone(futures[2].result())
+            self.assertEqual(futures[3].result(), 0)
+            self.assertEqual(synchronized.cut(2), 1)
+
+        with self.assertRaises(RuntimeError):
+            synchronized.get_root(0)
+
+    def test_close_while_submitting(self):
+        synchronized = SynchronizedForest(ArrayLinkCutForest(10), max_batch=8)
+        futures = []
+        submitted = threading.Event()
+
+        def submit_until_closed():
+            while True:
+                try:
+                    futures.append(synchronized.submit(Op.GET_ROOT, 3))
+                except RuntimeError:
+                    return
+
+                if len(futures) >= 1000:
+                    submitted.set()
+
+        with ThreadPoolExecutor(4) as executor:
+            submitters = [executor.submit(submit_until_closed) for _ in range(4)]
+            try:
+                self.assertTrue(submitted.wait(timeout=10))
+            finally:
+                synchronized.close()
+
+        # The submitters only stop because the forest is closed.
+        for submitter in submitters:
+            submitter.result(timeout=10)
+
+        # Every operation queued before closing is applied.
+        for future in futures:
+            self.assertEqual(future.result(timeout=10), 3)
+
+
+class TestAsyncForest(unittest.TestCase):
+    def test_async(self):
+        async def main():
+            forest = ArrayLinkCutForest(100)
+            async with AsyncForest(forest) as f:
+                await asyncio.gather(*(f.link(u, u - 1) for u in range(1, 100)))
+                roots = await asyncio.gather(*(f.get_root(u) for u in range(100)))
+                self.assertEqual(roots, [0] * 100)
+
+                await f.evert(99)
+                self.assertEqual(await f.lca(0, 50), 50)
+                self.assertTrue(await f.connected(0, 99))
+
+        asyncio.run(main())
+
+
+if __name__ == "__main__":
+    unittest.main()
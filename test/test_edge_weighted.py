@@ -0,0 +1,90 @@
+import random
+import unittest
+
+from edge_weighted_forest import EdgeWeightedForest
+
+
+def naive_path(adjacency, u, v):
+    """
+    Returns the edges `(a, b, w)` on the path from `u` to `v`, or `None` if there is none.
+    """
+
+    previous = {u: None}
+    stack = [u]
+    while stack:
+        a = stack.pop()
+        for b, w in adjacency[a].items():
+            if b not in previous:
+                previous[b] = (a, w)
+                stack.append(b)
+
+    if v not in previous:
+        return None
+
+    path = []
+    while previous[v] is not None:
+        a, w = previous[v]
+        path.append((a, v, w))
+        v = a
+
+    return path
+
+
+class TestEdgeWeighted(unittest.TestCase):
+    def test_simple(self):
+        forest = EdgeWeightedForest(5)
+        forest.link(0, 1, 3)
+        forest.link(1, 2, 7)
+        forest.link(3, 2, 5)
+        forest.link(3, 4, 1)
+
+        self.assertEqual(forest.path_max_edge(0, 4), (1, 2, 7))
+        self.assertEqual(forest.path_max_edge(4, 3), (3, 4, 1))
+        self.assertIsNone(forest.path_max_edge(2, 2))
+        self.assertEqual(forest.weight(2, 3), 5)
+
+        self.assertEqual(forest.cut(2, 1), 7)
+        self.assertFalse(forest.connected(0, 4))
+        self.assertFalse(forest.has_edge(1, 2))
+        self.assertEqual(forest.path_max_edge(4, 2), (3, 2, 5))
+
+        forest.link(0, 4, 2)
+        self.assertEqual(forest.path_max_edge(1, 2), (3, 2, 5))
+
+    def test_random(self):
+        rng = random.Random(17)
+        n = 30
+        forest = EdgeWeightedForest(n)
+        adjacency = [{} for _ in range(n)]
+        edges = []
+
+        for _ in range(3000):
+            u = rng.randrange(n)
+            v = rng.randrange(n)
+            path = naive_path(adjacency, u, v)
+            op = rng.randrange(3)
+            if op == 0:
+                if path is None:
+                    w = rng.random()
+                    forest.link(u, v, w)
+                    adjacency[u][v] = adjacency[v][u] = w
+                    edges.append((u, v))
+            elif op == 1:
+                if edges:
+                    a, b = edges.pop(rng.randrange(len(edges)))
+                    self.assertEqual(forest.cut(b, a), adjacency[a].pop(b))
+                    del adjacency[b][a]
+            else:
+                self.assertEqual(forest.connected(u, v), path is not None)
+                if path is not None:
+                    expected = max(path, key=lambda e: e[2]) if path else None
+                    actual = forest.path_max_edge(u, v)
+                    if expected is None:
+                        self.assertIsNone(actual)
+                    else:
+                        self.assertEqual(actual[2], expected[2])
+                        self.assertEqual(set(actual[:2]), set(expected[:2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import io
+import unittest
+
+from link_cut_tree import ArrayLinkCutForest, LinkCutForest, NIL
+from test.forest_model import PathAddNode
+
+PARENTS = [NIL, 0, 0, 1, 1, 2, NIL, 6, 3]
+
+
+class TestExport(unittest.TestCase):
+    def export(self, forest, **kwargs):
+        f = io.StringIO()
+        forest.export(f, **kwargs)
+        return f.getvalue()
+
+    def test_edges(self):
+        forest = ArrayLinkCutForest.from_parent_array(PARENTS)
+        self.assertEqual(
+            self.export(forest, format="edges"), "1 0\n2 0\n3 1\n4 1\n5 2\n7 6\n8 3\n"
+        )
+
+        forest.evert(3)
+        self.assertEqual(self.export(forest, format="edges", node=7), "7 6\n")
+        self.assertEqual(self.export(forest, format="edges", node=4, depth=1), "4 1\n")
+        self.assertEqual(
+            self.export(forest, format="edges", node=3, depth=2),
+            "1 3\n8 3\n0 1\n4 1\n",
+        )
+
+    def test_dot(self):
+        forest = LinkCutForest.from_parent_array(PARENTS, list('abcdefg"i'))
+        self.assertEqual(
+            self.export(forest, node=6),
+            "digraph forest {\n  6;\n  7;\n  6 -> 7;\n}\n",
+        )
+        self.assertEqual(
+            self.export(forest, node=7, labels=True),
+            'digraph forest {\n  7 [label="\\""];\n  6 [label="g"];\n  6 -> 7;\n}\n',
+        )
+
+    def test_labels_after_path_update(self):
+        forest = LinkCutForest.from_parent_array([NIL, 0, 1], [0] * 3, PathAddNode)
+        forest.nodes[2].lc_path_update(10)
+        self.assertEqual(
+            self.export(forest, labels=True),
+            "digraph forest {\n"
+            '  0 [label="10"];\n  1 [label="10"];\n  2 [label="10"];\n'
+            "  0 -> 1;\n  1 -> 2;\n}\n",
+        )
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            self.export(ArrayLinkCutForest(1), format="svg")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import random
+import unittest
+
+from link_cut_tree import LinkCutForest, NIL, Op, make_node_class
+from test.forest_model import ForestModel, apply_change, random_operations
+
+
+def expected_aggregate(augmentation, values):
+    if augmentation == "sum":
+        return sum(values)
+    elif augmentation == "min":
+        return min(values)
+    elif augmentation == "max":
+        return max(values)
+    elif augmentation == "size":
+        return len(values)
+    else:
+        return None
+
+
+class TestFastNodes(unittest.TestCase):
+    def test_cached(self):
+        self.assertIs(make_node_class("sum"), make_node_class("sum"))
+        self.assertIsNot(make_node_class("sum"), make_node_class("min"))
+        self.assertFalse(hasattr(make_node_class("sum")(1), "__dict__"))
+
+    def test_unknown(self):
+        with self.assertRaises(AssertionError):
+            make_node_class("product")
+
+    def test_random(self):
+        for augmentation in [None, "sum", "min", "max", "size"]:
+            with self.subTest(augmentation=augmentation):
+                self.run_random(augmentation)
+
+    def run_random(self, augmentation):
+        rng = random.Random(13)
+        n = 40
+        values = [rng.randrange(100) for _ in range(n)]
+        parents = [NIL] + [rng.randrange(u) for u in range(1, n)]
+        forest = LinkCutForest.from_parent_array(
+            parents, values, make_node_class(augmentation)
+        )
+        nodes = forest.nodes
+        model = ForestModel(parents=parents)
+
+        for op, u, v in random_operations(rng, model, 2000, queries=3):
+            if op == Op.CUT:
+                self.assertIs(nodes[u].lc_cut(), nodes[v])
+                continue
+            elif op is not None:
+                apply_change(forest, op, u, v)
+                continue
+
+            query = rng.randrange(3)
+            if query == 0:
+                self.assertIs(nodes[u].lc_get_root(), nodes[model.root(u)])
+            elif query == 1:
+                connected = model.connected(u, v)
+                self.assertEqual(nodes[u].lc_connected(nodes[v]), connected)
+                if connected:
+                    self.assertIs(nodes[u].lc_lca(nodes[v]), nodes[model.lca(u, v)])
+            else:
+                self.assertEqual(
+                    nodes[u].lc_path_aggregate(),
+                    expected_aggregate(
+                        augmentation, [values[w] for w in model.root_path(u)]
+                    ),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -150,5 +150,47 @@ class TestLCA(unittest.TestCase):
         self.assertEqual(nodes["h"].lc_lca(nodes["f"]), nodes["b"])
 
 
+class TestConnected(unittest.TestCase):
+    def test_connected(self):
+        nodes = {c: Node(c) for c in "abcdef"}
+        build_link_cut_tree(
+            (nodes["a"], [(nodes["b"], [(nodes["d"], [])]), (nodes["c"], [])])
+        )
+        build_link_cut_tree((nodes["e"], [(nodes["f"], [])]))
+
+        self.assertTrue(nodes["d"].lc_connected(nodes["c"]))
+        self.assertTrue(nodes["a"].lc_connected(nodes["d"]))
+        self.assertTrue(nodes["d"].lc_connected(nodes["a"]))
+        self.assertTrue(nodes["f"].lc_connected(nodes["f"]))
+        self.assertFalse(nodes["d"].lc_connected(nodes["f"]))
+        self.assertFalse(nodes["e"].lc_connected(nodes["b"]))
+
+        nodes["b"].lc_cut()
+        self.assertFalse(nodes["d"].lc_connected(nodes["c"]))
+        self.assertTrue(nodes["d"].lc_connected(nodes["b"]))
+
+        nodes["b"].lc_link(nodes["f"])
+        self.assertTrue(nodes["d"].lc_connected(nodes["e"]))
+
+
+class TestDeep(unittest.TestCase):
+    def test_deep_path(self):
+        n = 20000
+        nodes = [PathSumNode(i, 1) for i in range(n)]
+
+        structure = (nodes[-1], [])
+        for node in reversed(nodes[:-1]):
+            structure = (node, [structure])
+
+        forest = build_link_cut_tree(structure)
+
+        self.assertEqual(forest.nodes, nodes)
+        self.assertEqual(nodes[-1].lc_path_aggregate(), n)
+        self.assertEqual(nodes[-1].lc_get_root(), nodes[0])
+
+        nodes[-1].lc_evert()
+        self.assertEqual(nodes[0].lc_path_aggregate(), n)
+
+
 if __name__ == "__main__":
     unittest.main()
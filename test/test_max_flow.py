@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from max_flow import max_flow
+
+
+def edmonds_karp(n, tails, heads, capacities, s, t):
+    capacity = [[0] * n for _ in range(n)]
+    for u, v, c in zip(tails, heads, capacities):
+        capacity[u][v] += c
+
+    total = 0
+    while True:
+        previous = [None] * n
+        previous[s] = s
+        queue = [s]
+        for u in queue:
+            for v in range(n):
+                if capacity[u][v] > 0 and previous[v] is None:
+                    previous[v] = u
+                    queue.append(v)
+
+        if previous[t] is None:
+            return total
+
+        path = [t]
+        while path[-1] != s:
+            path.append(previous[path[-1]])
+
+        low = min(capacity[u][v] for v, u in zip(path, path[1:]))
+        for v, u in zip(path, path[1:]):
+            capacity[u][v] -= low
+            capacity[v][u] += low
+
+        total += low
+
+
+class TestMaxFlow(unittest.TestCase):
+    def check_flow(self, n, tails, heads, capacities, s, t, value, flows):
+        excess = [0] * n
+        for u, v, c, f in zip(tails, heads, capacities, flows):
+            self.assertTrue(0 <= f <= c)
+            excess[u] -= f
+            excess[v] += f
+
+        for v in range(n):
+            if v not in (s, t):
+                self.assertEqual(excess[v], 0)
+
+        self.assertEqual(excess[t], value)
+
+    def test_simple(self):
+        tails = [0, 0, 1, 1, 2, 3]
+        heads = [1, 2, 2, 3, 3, 0]
+        capacities = [3, 2, 1, 2, 4, 5]
+        value, flows = max_flow(4, tails, heads, capacities, 0, 3)
+        self.assertEqual(value, 5)
+        self.assertEqual(flows, [3, 2, 1, 2, 3, 0])
+
+    def test_disconnected(self):
+        self.assertEqual(max_flow(3, [0], [1], [5], 0, 2), (0, [0]))
+
+    def test_random(self):
+        rng = random.Random(19)
+        for _ in range(50):
+            n = rng.randrange(2, 12)
+            m = rng.randrange(30)
+            tails = [rng.randrange(n) for _ in range(m)]
+            heads = [rng.randrange(n) for _ in range(m)]
+            capacities = [rng.randrange(10) for _ in range(m)]
+
+            value, flows = max_flow(n, tails, heads, capacities, 0, n - 1)
+            self.assertEqual(value, edmonds_karp(n, tails, heads, capacities, 0, n - 1))
+            self.check_flow(n, tails, heads, capacities, 0, n - 1, value, flows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import operator
+import random
+import unittest
+
+from link_cut_tree import (
+    ARG_MAX,
+    ARG_MIN,
+    ArrayLinkCutForest,
+    COUNT,
+    LinkCutForest,
+    MAX,
+    MIN,
+    Monoid,
+    MonoidNode,
+    NIL,
+    SUM,
+    monoid_product,
+)
+from test.forest_model import ForestModel, apply_change, random_operations
+
+
+def _singleton(value, key):
+    return (value,)
+
+
+# Concatenates the values on a path, ordered from the root.
+CONCAT = Monoid((), operator.add, lift=_singleton, commutative=False)
+
+ALL = monoid_product(SUM, COUNT, MIN, MAX, ARG_MIN, ARG_MAX, CONCAT)
+
+
+def expected(values, path):
+    path_values = [values[u] for u in path]
+    key_values = [(values[u], u) for u in path]
+    return (
+        sum(path_values),
+        len(path),
+        min(path_values),
+        max(path_values),
+        min(key_values, key=lambda p: p[0]),
+        max(key_values, key=lambda p: p[0]),
+        tuple(path_values),
+    )
+
+
+class TestMonoid(unittest.TestCase):
+    def test_product(self):
+        m = monoid_product(SUM, MIN)
+        self.assertEqual(m.identity, (0, MIN.identity))
+        self.assertEqual(m.lift(3, None), (3, 3))
+        self.assertEqual(m.combine((1, 5), (2, 3)), (3, 3))
+        self.assertIsNone(m.inverse)
+        self.assertTrue(m.commutative)
+
+        m = monoid_product(SUM, COUNT)
+        self.assertEqual(m.inverse((3, 2)), (-3, -2))
+        self.assertFalse(monoid_product(SUM, CONCAT).commutative)
+
+    def run_random(self, forest, path_aggregate, key):
+        rng = random.Random(6)
+        model = ForestModel(len(self.values))
+
+        for op, u, v in random_operations(rng, model, 2000):
+            if op is not None:
+                apply_change(forest, op, u, v)
+                continue
+
+            *rest, arg_min, arg_max, concat = path_aggregate(u)
+            self.assertEqual(
+                (
+                    *rest,
+                    (arg_min[0], key(arg_min[1])),
+                    (arg_max[0], key(arg_max[1])),
+                    concat,
+                ),
+                expected(self.values, list(reversed(model.root_path(u)))),
+            )
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.values = [rng.randrange(20) for _ in range(30)]
+
+    def test_array(self):
+        forest = ArrayLinkCutForest(len(self.values), self.values, monoid=ALL)
+        self.run_random(forest, forest.path_aggregate, lambda u: u)
+
+    def test_nodes(self):
+        forest = LinkCutForest.from_parent_array(
+            [NIL] * len(self.values), self.values, MonoidNode.with_monoid(ALL)
+        )
+        nodes = forest.nodes
+        self.run_random(forest, lambda u: nodes[u].lc_path_aggregate(), forest.node_id)
+
+    def test_arg_ties(self):
+        rng = random.Random(27)
+        n = 30
+        values = [rng.randrange(2) for _ in range(n)]
+        forest = ArrayLinkCutForest(n, values, monoid=ARG_MAX)
+        node_forest = LinkCutForest.from_parent_array(
+            [NIL] * n, values, MonoidNode.with_monoid(ARG_MAX)
+        )
+        nodes = node_forest.nodes
+        model = ForestModel(n)
+
+        for op, u, v in random_operations(rng, model, 3000):
+            if op is not None:
+                apply_change(forest, op, u, v)
+                apply_change(node_forest, op, u, v)
+                continue
+
+            # Ties are broken towards the root.
+            w = max(reversed(model.root_path(u)), key=values.__getitem__)
+            self.assertEqual(forest.path_aggregate(u), (values[w], w))
+            value, node = nodes[u].lc_path_aggregate()
+            self.assertEqual((value, node), (values[w], nodes[w]))
+
+    def test_default_monoid(self):
+        forest = LinkCutForest.from_parent_array([NIL, 0, 1], [1, 2, 3], MonoidNode)
+        self.assertEqual(forest.nodes[2].lc_path_aggregate(), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import random
+import unittest
+
+from link_cut_tree import ARG_MAX, NIL, Op, SUM
+from partitioned_forest import PartitionedForest, _Shard
+from test.forest_model import random_batch
+
+
+class TestPartitionedForest(unittest.TestCase):
+    def test_random_batch(self):
+        n = 40
+        opcodes, us, vs, expected = random_batch(random.Random(26), n, 3000)
+        with PartitionedForest(n, 3, range(n), monoid=SUM) as forest:
+            self.assertEqual(forest.apply_batch(opcodes, us, vs), expected)
+
+            # Every tree is owned by a single shard.
+            for u in range(n):
+                self.assertEqual(
+                    forest.shard_of(u), forest.shard_of(forest.get_root(u))
+                )
+
+    def test_from_parent_array(self):
+        parents = [NIL, 0, 0, NIL, 3, NIL, 5, 6, 7]
+        with PartitionedForest.from_parent_array(
+            parents, 2, [1] * len(parents), monoid=SUM
+        ) as forest:
+            self.assertEqual(forest.shard_of(1), forest.shard_of(0))
+            self.assertNotEqual(forest.shard_of(8), forest.shard_of(0))
+            self.assertEqual(forest.path_aggregate(8), 4)
+            self.assertFalse(forest.connected(2, 4))
+            self.assertEqual(forest.connected_many([(1, 2), (4, 3)]), [True, True])
+
+            # Linking the larger tree of node 5 moves it to the shard of node 2.
+            forest.link(5, 2)
+            self.assertEqual(forest.shard_of(8), forest.shard_of(0))
+            self.assertEqual(forest.path_aggregate(8), 6)
+            self.assertEqual(forest.lca(8, 1), 0)
+
+    def test_global_keys(self):
+        values = [5, 1, 9, 2, 7, 3]
+        with PartitionedForest(len(values), 3, values, monoid=ARG_MAX) as forest:
+            forest.link(1, 0)
+            forest.link(3, 2)
+            forest.link(5, 4)
+            forest.link(2, 1)
+            forest.link(4, 3)
+            self.assertEqual(forest.path_aggregate(5), (9, 2))
+            self.assertEqual(forest.cut(2), 1)
+            self.assertEqual(forest.get_root(5), 2)
+            self.assertEqual(forest.lca(5, 3), 3)
+
+    def test_shard(self):
+        # A shard owning the trees of the nodes 10 and 13, where 11 and 12 are children of 10.
+        shard = _Shard([10, 11, 12, 13], [NIL, 0, 0, NIL], [1, 2, 3, 0], None, SUM)
+        self.assertEqual(len(shard.forest), 4)
+
+        nodes, parents, values = shard.extract(0)
+        self.assertEqual(nodes[0], 10)
+        self.assertEqual(sorted(nodes), [10, 11, 12])
+        self.assertEqual(parents, [NIL, 10, 10])
+        self.assertEqual(values, [1, 2, 3])
+        self.assertEqual(list(shard.global_ids), [NIL, NIL, NIL, 13])
+
+        # The free slots are reused, and the forest grows when they run out.
+        local = shard.insert([20, 21], [NIL, 20], [4, 5], 3)
+        local = shard.insert([30, 31, 32], [NIL, 30, 31], [6, 7, 8], local[1])
+        self.assertEqual(len(shard.forest), 8)
+
+        results = []
+        shard.apply_batch(
+            [Op.PATH_AGGREGATE, Op.GET_ROOT], [local[2]] * 2, [NIL] * 2, results
+        )
+        self.assertEqual(results, [30, 13])
+
+    def test_errors(self):
+        with PartitionedForest(4, 2) as forest:
+            forest.link(1, 0)
+            with self.assertRaises(AssertionError):
+                forest.link(1, 2)
+
+            self.assertEqual(forest.get_root(1), 0)
+            with self.assertRaises(AssertionError):
+                forest.apply_batch([Op.GET_ROOT, Op.CUT], [1, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
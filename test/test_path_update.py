@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from link_cut_tree import build_link_cut_tree, LinkCutForest
+from test.forest_model import (
+    ForestModel,
+    PathAddNode,
+    apply_change,
+    random_operations,
+)
+
+
+class TestPathUpdate(unittest.TestCase):
+    def test_path_update(self):
+        nodes = {c: PathAddNode(i) for i, c in enumerate("ABCDEFG")}
+        build_link_cut_tree(
+            (
+                nodes["A"],
+                [
+                    (nodes["B"], [(nodes["D"], []), (nodes["E"], [])]),
+                    (nodes["C"], [(nodes["F"], []), (nodes["G"], [])]),
+                ],
+            )
+        )
+
+        nodes["E"].lc_path_update(10)
+        self.assertEqual(nodes["E"].lc_path_aggregate(), (10, 35))
+        self.assertEqual(nodes["D"].lc_path_aggregate(), (3, 24))
+        self.assertEqual(nodes["G"].lc_path_aggregate(), (2, 18))
+
+        nodes["G"].lc_evert()
+        nodes["D"].lc_path_update(-20)
+        self.assertEqual(nodes["G"].lc_path_aggregate(), (-14, -14))
+        self.assertEqual(nodes["E"].lc_path_aggregate(), (-18, -37))
+        self.assertEqual(nodes["F"].lc_path_aggregate(), (-18, -27))
+
+        values = {name: node.value for name, node in nodes.items()}
+        for name, node in nodes.items():
+            node.lc_expose()
+            self.assertEqual(node.value, values[name])
+
+    def test_random(self):
+        rng = random.Random(5)
+        n = 40
+        values = [rng.randrange(100) for _ in range(n)]
+        nodes = [PathAddNode(value) for value in values]
+        forest = LinkCutForest(nodes)
+        model = ForestModel(n)
+
+        for op, u, v in random_operations(rng, model, 3000, queries=2):
+            if op is not None:
+                apply_change(forest, op, u, v)
+                continue
+
+            path = model.root_path(u)
+            if rng.randrange(2):
+                delta = rng.randrange(-50, 50)
+                nodes[u].lc_path_update(delta)
+                for w in path:
+                    values[w] += delta
+            else:
+                path_values = [values[w] for w in path]
+                self.assertEqual(
+                    nodes[u].lc_path_aggregate(), (min(path_values), sum(path_values))
+                )
+                self.assertEqual(nodes[u].value, values[u])
+
+
+if __name__ == "__main__":
+    unittest.main()
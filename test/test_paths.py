@@ -0,0 +1,53 @@
+import random
+import unittest
+from array import array
+
+from link_cut_tree import ArrayLinkCutForest, LinkCutForest, NIL, make_node_class
+from test.forest_model import ForestModel, apply_change, random_operations
+
+
+class TestPaths(unittest.TestCase):
+    def run_random(self, forest):
+        rng = random.Random(14)
+        model = ForestModel(len(forest))
+
+        for op, u, v in random_operations(rng, model, 3000):
+            if op is not None:
+                apply_change(forest, op, u, v)
+                continue
+
+            path = model.path(u, v)
+            if path is not None:
+                self.assertEqual(forest.path_nodes(u, v), array("l", path))
+                self.assertEqual(forest.path_length(u, v), len(path) - 1)
+
+    def test_array(self):
+        self.run_random(ArrayLinkCutForest(30))
+
+    def test_nodes(self):
+        self.run_random(LinkCutForest.from_parent_array([NIL] * 30))
+
+    def test_fast_nodes(self):
+        self.run_random(
+            LinkCutForest.from_parent_array([NIL] * 30, node_cls=make_node_class())
+        )
+
+    def test_lc_path_nodes(self):
+        forest = LinkCutForest.from_parent_array([NIL, 0, 1, 0, 3], list("abcde"))
+        c, e = forest.nodes[2], forest.nodes[4]
+
+        self.assertEqual([x.value for x in c.lc_path_nodes(e)], list("cbade"))
+        self.assertEqual([x.value for x in e.lc_path_nodes(c)], list("edabc"))
+        self.assertEqual([x.value for x in c.lc_path_nodes(c)], ["c"])
+        self.assertEqual(c.lc_path_length(e), 4)
+
+        e.lc_evert()
+        self.assertEqual([x.value for x in c.lc_path_nodes(e)], list("cbade"))
+        self.assertEqual(
+            [x.value for x in forest.nodes[1].lc_path_nodes(forest.nodes[0])],
+            list("ba"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
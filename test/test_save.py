@@ -0,0 +1,121 @@
+import os
+import random
+import tempfile
+import unittest
+
+from link_cut_tree import (
+    ArrayLinkCutForest,
+    ForestWriter,
+    LinkCutForest,
+    MonoidNode,
+    NIL,
+    SUM,
+    read_forest,
+)
+from test.forest_model import PathAddNode
+
+
+class TestSave(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "forest.lctf")
+
+        rng = random.Random(23)
+        self.parents = [NIL] + [rng.randrange(u) for u in range(1, 100)]
+        self.values = [rng.randrange(-1000, 1000) for _ in range(100)]
+
+    def test_array(self):
+        forest = ArrayLinkCutForest.from_parent_array(
+            self.parents, self.values, monoid=SUM
+        )
+        forest.evert(50)
+        forest.save(self.path)
+
+        loaded = ArrayLinkCutForest.load(self.path, monoid=SUM)
+        self.assertEqual(list(loaded.parent_array()), list(forest.parent_array()))
+        for u in range(len(forest)):
+            self.assertEqual(loaded.path_aggregate(u), forest.path_aggregate(u))
+
+    def test_nodes(self):
+        forest = LinkCutForest.from_parent_array(self.parents, self.values, MonoidNode)
+        forest.save(self.path)
+
+        loaded = LinkCutForest.load(self.path, MonoidNode)
+        self.assertEqual(list(loaded.parent_array()), self.parents)
+        for u in range(len(forest)):
+            self.assertEqual(loaded.path_aggregate(u), forest.path_aggregate(u))
+
+    def test_path_update(self):
+        forest = LinkCutForest.from_parent_array(
+            [NIL, 0, 1, 2, 3, 4, 5], [0] * 7, PathAddNode
+        )
+        forest.nodes[6].lc_path_update(10)
+        forest.save(self.path)
+
+        self.assertEqual(list(read_forest(self.path)[1]), [10] * 7)
+        loaded = LinkCutForest.load(self.path, PathAddNode)
+        self.assertEqual(loaded.nodes[6].lc_path_aggregate(), (10, 70))
+
+    def test_values(self):
+        ArrayLinkCutForest.from_parent_array([NIL, 0]).save(self.path)
+        self.assertEqual(read_forest(self.path)[1], None)
+
+        ArrayLinkCutForest.from_parent_array([NIL, 0], [1, 2.5]).save(self.path)
+        self.assertEqual(list(read_forest(self.path)[1]), [1.0, 2.5])
+
+        with self.assertRaises(ValueError):
+            ArrayLinkCutForest.from_parent_array([NIL], ["a"]).save(self.path)
+
+        ArrayLinkCutForest.from_parent_array([NIL], [-(2**63)]).save(self.path)
+        self.assertEqual(list(read_forest(self.path)[1]), [-(2**63)])
+
+        ArrayLinkCutForest.from_parent_array([NIL, 0], [2**53, 0.5]).save(self.path)
+        self.assertEqual(list(read_forest(self.path)[1]), [2**53, 0.5])
+
+        for values in [[2**63], [2**60 + 1, 0.5], [10**400, 0.5], [True], [1, None]]:
+            forest = ArrayLinkCutForest.from_parent_array([NIL] * len(values), values)
+            with self.assertRaises(ValueError):
+                forest.save(self.path)
+
+        with ForestWriter(self.path, 1, "q") as writer:
+            with self.assertRaises(ValueError):
+                writer.write([NIL], [0.5])
+            writer.write([NIL], [1])
+
+    def test_writer(self):
+        with ForestWriter(self.path, len(self.parents), "q") as writer:
+            for i in range(0, len(self.parents), 7):
+                writer.write(self.parents[i : i + 7], self.values[i : i + 7])
+
+        parents, values = read_forest(self.path)
+        self.assertEqual(list(parents), self.parents)
+        self.assertEqual(list(values), self.values)
+        self.assertEqual(os.path.getsize(self.path), 16 + 16 * len(self.parents))
+
+    def test_failed_save(self):
+        ArrayLinkCutForest.from_parent_array(self.parents, self.values).save(self.path)
+        with open(self.path, "rb") as f:
+            saved = f.read()
+
+        with self.assertRaises(ValueError):
+            ArrayLinkCutForest.from_parent_array([NIL, 0], [1, 2**64]).save(self.path)
+
+        with self.assertRaises(AssertionError):
+            with ForestWriter(self.path, 2) as writer:
+                writer.write([NIL])
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), saved)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["forest.lctf"])
+
+    def test_invalid(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a forest file")
+
+        with self.assertRaises(ValueError):
+            read_forest(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from link_cut_tree import ArrayLinkCutForest, ForestSnapshot, LinkCutForest, NIL
+from test.forest_model import ForestModel
+
+
+def attached_lca_many(name, pairs):
+    snapshot = ForestSnapshot.attach(name)
+    try:
+        return list(snapshot.lca_many(pairs))
+    finally:
+        snapshot.close()
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_snapshot(self):
+        rng = random.Random(20)
+        for n in [1, 2, 3, 10, 100]:
+            parents = [
+                NIL if u == 0 or rng.random() < 0.1 else rng.randrange(u)
+                for u in range(n)
+            ]
+            model = ForestModel(parents=parents)
+            snapshot = ForestSnapshot(parents)
+            for u in range(n):
+                self.assertEqual(snapshot.get_root(u), model.root(u))
+                self.assertEqual(snapshot.depth(u), model.depth(u))
+                for v in range(n):
+                    if model.connected(u, v):
+                        self.assertEqual(snapshot.lca(u, v), model.lca(u, v))
+
+    def test_not_shared(self):
+        snapshot = ForestSnapshot([NIL, 0])
+        snapshot.close()
+        self.assertEqual(snapshot.lca(0, 1), 0)
+        with self.assertRaises(AssertionError):
+            snapshot.unlink()
+
+    def test_different_trees(self):
+        snapshot = ForestSnapshot([NIL, NIL])
+        with self.assertRaises(AssertionError):
+            snapshot.lca(0, 1)
+
+    def run_lca_many(self, forest):
+        rng = random.Random(21)
+        model = ForestModel(parents=forest.parent_array())
+        n = len(model)
+        pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(200)]
+        expected = [model.lca(u, v) for u, v in pairs]
+
+        self.assertEqual(list(forest.lca_many(pairs)), expected)
+        forest.freeze()
+        self.assertEqual(list(forest.lca_many(pairs)), expected)
+
+        # The snapshot is out of date after changing the forest.
+        forest.evert(n - 1)
+        model.evert(n - 1)
+        expected = [model.lca(u, v) for u, v in pairs]
+        self.assertEqual(list(forest.lca_many(pairs)), expected)
+
+    def test_lca_many_node_operations(self):
+        parents = [NIL, 0, 0, 1, 1]
+        forest = LinkCutForest.from_parent_array(parents)
+        forest.freeze()
+        self.assertEqual(list(forest.lca_many([(3, 4), (3, 2)])), [1, 0])
+
+        forest.nodes[3].lc_evert()
+        self.assertEqual(list(forest.lca_many([(4, 2), (0, 2)])), [1, 0])
+
+        forest.nodes[1].lc_cut()
+        forest.nodes[0].lc_evert()
+        self.assertEqual(list(forest.lca_many([(2, 4), (1, 4)])), [0, 1])
+
+        forest.freeze()
+        forest.nodes[4].lc_cut()
+        forest.nodes[4].lc_link(forest.nodes[2])
+        self.assertEqual(list(forest.lca_many([(4, 1), (4, 2)])), [0, 2])
+
+    def test_lca_many(self):
+        rng = random.Random(22)
+        parents = [NIL] + [rng.randrange(u) for u in range(1, 50)]
+        self.run_lca_many(ArrayLinkCutForest.from_parent_array(parents))
+        self.run_lca_many(LinkCutForest.from_parent_array(parents))
+
+    def test_shared(self):
+        rng = random.Random(24)
+        parents = [NIL] + [rng.randrange(u) for u in range(1, 200)]
+        forest = ArrayLinkCutForest.from_parent_array(parents)
+        snapshot = forest.freeze()
+        shared = snapshot.share()
+        self.addCleanup(shared.unlink)
+
+        # The live forest can keep changing without affecting the snapshot.
+        forest.evert(150)
+        forest.cut(0)
+
+        pairs = [(rng.randrange(200), rng.randrange(200)) for _ in range(500)]
+        model = ForestModel(parents=parents)
+        expected = [model.lca(u, v) for u, v in pairs]
+        self.assertEqual(list(shared.lca_many(pairs)), expected)
+        self.assertEqual(attached_lca_many(shared.name, pairs), expected)
+        self.assertEqual(
+            [shared.depth(u) for u in range(200)],
+            [snapshot.depth(u) for u in range(200)],
+        )
+
+        with ThreadPoolExecutor(4) as executor:
+            chunks = [pairs[i : i + 50] for i in range(0, len(pairs), 50)]
+            results = executor.map(shared.lca_many, chunks)
+            self.assertEqual([w for r in results for w in r], expected)
+
+        with multiprocessing.get_context("spawn").Pool(2) as pool:
+            self.assertEqual(
+                pool.apply(attached_lca_many, (shared.name, pairs)), expected
+            )
+
+    def test_independent_process(self):
+        shared = ForestSnapshot([NIL, 0, 0, 1]).share()
+        self.addCleanup(shared.unlink)
+
+        # Exiting processes that attached must not remove the shared memory.
+        code = (
+            "import sys; from test.test_snapshot import attached_lca_many; "
+            "print(attached_lca_many(sys.argv[1], [(3, 2)]))"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for _ in range(2):
+            output = subprocess.run(
+                [sys.executable, "-c", code, shared.name],
+                cwd=root,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            self.assertEqual(output.stdout, "[0]\n")
+            self.assertEqual(output.stderr, "")
+
+        snapshot = ForestSnapshot.attach(shared.name)
+        self.assertEqual(snapshot.lca(3, 1), 1)
+        snapshot.close()
+
+    def test_owner_exits(self):
+        # The snapshot stays shared after the process that shared it exits.
+        code = (
+            "from link_cut_tree import ForestSnapshot; "
+            "shared = ForestSnapshot([-1, 0, 0, 1]).share(); "
+            "print(shared.name); shared.close()"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(output.stderr, "")
+
+        snapshot = ForestSnapshot.attach(output.stdout.strip())
+        self.addCleanup(snapshot.unlink)
+        self.assertEqual(snapshot.lca(3, 2), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import random
+import unittest
+
+from minimum_spanning_forest import MinimumSpanningForest
+
+
+def kruskal(n, edges):
+    parent = list(range(n))
+
+    def find(u):
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+
+        return u
+
+    total = 0
+    for u, v, w in sorted(edges, key=lambda e: e[2]):
+        a = find(u)
+        b = find(v)
+        if a != b:
+            parent[a] = b
+            total += w
+
+    return total
+
+
+class TestMinimumSpanningForest(unittest.TestCase):
+    def test_simple(self):
+        msf = MinimumSpanningForest(4)
+        self.assertIsNone(msf.insert_edge(0, 1, 5))
+        self.assertIsNone(msf.insert_edge(1, 2, 3))
+        self.assertEqual(msf.insert_edge(0, 2, 9), (0, 2, 9))
+        self.assertEqual(msf.insert_edge(2, 0, 1), (0, 1, 5))
+        self.assertEqual(msf.insert_edge(3, 3, 0), (3, 3, 0))
+        self.assertEqual(msf.total_weight, 4)
+        self.assertFalse(msf.connected(0, 3))
+        self.assertEqual(sorted(msf.edges()), [(1, 2, 3), (2, 0, 1)])
+
+    def test_random(self):
+        rng = random.Random(18)
+        n = 40
+        msf = MinimumSpanningForest(n)
+        edges = []
+        for _ in range(1000):
+            edge = (rng.randrange(n), rng.randrange(n), rng.randrange(100))
+            edges.append(edge)
+            msf.insert_edge(*edge)
+            self.assertEqual(msf.total_weight, kruskal(n, edges))
+
+        self.assertEqual(sum(w for _, _, w in msf.edges()), msf.total_weight)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from itertools import zip_longest
 
-from link_cut_tree import Node
+from link_cut_tree import Node, Traversal
 
 
 """
@@ -27,6 +27,82 @@ def assert_same_tree(unittest, t1, t2):
         assert_same_node(unittest, n1.right, n2.right)
 
 
+class TestNode(unittest.TestCase):
+    def test_slots(self):
+        self.assertFalse(hasattr(Node("x"), "__dict__"))
+
+    def test_children(self):
+        a = Node("A")
+        b = Node("B")
+        x = Node("x", a)
+        self.assertEqual(x.children, (a, None))
+        self.assertIs(a.parent, x)
+        self.assertEqual(a.child_index(), 0)
+
+        x.set_child(1, b)
+        self.assertEqual(x.children, (a, b))
+        self.assertIs(b.parent, x)
+        self.assertEqual(b.child_index(), 1)
+
+
+class CountingNode(Node):
+    updates = 0
+
+    def update_augmentation(self):
+        CountingNode.updates += 1
+
+
+class TestUpdates(unittest.TestCase):
+    def test_once_per_node(self):
+        for depth in range(1, 10):
+            deepest = t = CountingNode(0)
+            for i in range(1, depth):
+                t = CountingNode(i, t)
+
+            CountingNode.updates = 0
+            deepest.splay()
+            self.assertEqual(CountingNode.updates, depth if depth > 1 else 0)
+            self.assertEqual(
+                [x.value for x in deepest.traverse_subtree()],
+                list(range(depth)),
+            )
+
+
+class TestTraversal(unittest.TestCase):
+    def setUp(self):
+        self.tree = Node("d", Node("b", Node("a"), Node("c")), Node("f", Node("e")))
+
+    def values(self, order, reverse=False):
+        return "".join(n.value for n in self.tree.traverse_subtree(order, reverse))
+
+    def test_orders(self):
+        self.assertEqual(self.values(Traversal.in_order), "abcdef")
+        self.assertEqual(self.values(Traversal.pre_order), "dbacfe")
+        self.assertEqual(self.values(Traversal.post_order), "acbefd")
+        self.assertEqual(self.values(Traversal.in_order, True), "fedcba")
+
+    def test_reversed(self):
+        self.tree.left.reversed = True
+        self.assertEqual(self.values(Traversal.in_order), "cbadef")
+        self.assertEqual(self.values(Traversal.pre_order), "dbcafe")
+        self.assertEqual(self.values(Traversal.post_order), "cabefd")
+
+    def test_deep(self):
+        n = 100000
+        deepest = t = Node(0)
+        for i in range(1, n):
+            t = Node(i, t)
+
+        self.assertEqual([x.value for x in t.traverse_subtree()], list(range(n)))
+
+        t.reversed = True
+        deepest.splay()
+        self.assertIsNone(deepest.parent)
+        self.assertEqual(
+            [x.value for x in deepest.traverse_subtree()], list(reversed(range(n)))
+        )
+
+
 class TestSplayZig(unittest.TestCase):
     def setUp(self):
         self.zig1 = Node("y", Node("x", Node("A"), Node("B"),), Node("C"),)
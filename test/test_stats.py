@@ -0,0 +1,76 @@
+import json
+import unittest
+
+from link_cut_tree import ArrayLinkCutForest, LinkCutForest, Node, NIL
+
+
+class StatsNode(Node):
+    pass
+
+
+class TestStats(unittest.TestCase):
+    def check(self, forest):
+        stats = forest.enable_stats()
+
+        self.assertEqual(forest.get_root(99), 0)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["exposes"], 1)
+        self.assertEqual(snapshot["operations"]["get_root"]["count"], 1)
+        self.assertGreater(snapshot["splays"], 0)
+        self.assertGreater(snapshot["max_splay_depth"], 1)
+        self.assertEqual(
+            snapshot["rotations"], snapshot["splays"] * snapshot["rotations_per_splay"]
+        )
+
+        forest.apply_batch([4, 5, 4], [50, 50, 10])
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["exposes"], 4)
+        self.assertEqual(snapshot["operations"]["get_root"]["count"], 3)
+        self.assertEqual(snapshot["operations"]["path_aggregate"]["count"], 1)
+        json.dumps(snapshot)
+
+        stats.reset()
+        self.assertEqual(stats.snapshot()["exposes"], 0)
+
+        forest.disable_stats()
+        self.assertIsNone(forest.stats)
+        forest.get_root(99)
+        self.assertEqual(stats.snapshot()["exposes"], 0)
+        self.assertEqual(stats.snapshot()["operations"], {})
+
+    def test_array(self):
+        parents = [u - 1 for u in range(100)]
+        self.check(ArrayLinkCutForest.from_parent_array(parents))
+
+    def test_nodes(self):
+        parents = [NIL] + [u // 2 for u in range(1, 100)]
+        forest = LinkCutForest.from_parent_array(parents, node_cls=StatsNode)
+        self.check(forest)
+
+    def test_separate_forests(self):
+        parents = [NIL, 0, 1, 2]
+        a = LinkCutForest.from_parent_array(parents)
+        b = LinkCutForest.from_parent_array(parents)
+        stats = a.enable_stats()
+
+        b.get_root(3)
+        self.assertEqual(stats.snapshot()["exposes"], 0)
+
+        b.enable_stats()
+        b.disable_stats()
+        a.get_root(3)
+        self.assertEqual(stats.snapshot()["exposes"], 1)
+
+    def test_preferred_child_changes(self):
+        forest = ArrayLinkCutForest.from_parent_array([NIL, 0, 0, 1, 2])
+        stats = forest.enable_stats()
+
+        forest.lca(3, 4)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["exposes"], 2)
+        self.assertGreater(snapshot["preferred_child_changes"], 0)
+        self.assertEqual(snapshot["max_preferred_child_changes"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
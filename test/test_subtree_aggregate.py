@@ -0,0 +1,48 @@
+import random
+import unittest
+
+from link_cut_tree import LinkCutForest, NIL, SubtreeNode
+from test.forest_model import ForestModel, apply_change, random_operations
+
+
+class TestSubtreeAggregate(unittest.TestCase):
+    def test_build(self):
+        parents = [NIL, 0, 0, 1, 1, 2, NIL, 6]
+        values = [1 << i for i in range(len(parents))]
+        forest = LinkCutForest.from_parent_array(parents, values, SubtreeNode)
+
+        for u, node in enumerate(forest.nodes):
+            nodes = ForestModel(parents=parents).subtree(u)
+            self.assertEqual(node.lc_subtree_aggregate(), sum(values[w] for w in nodes))
+            self.assertEqual(node.lc_subtree_size(), len(nodes))
+
+    def test_random(self):
+        rng = random.Random(10)
+        n = 40
+        values = [rng.randrange(100) for _ in range(n)]
+        forest = LinkCutForest.from_parent_array([NIL] * n, values, SubtreeNode)
+        nodes = forest.nodes
+        model = ForestModel(n)
+
+        for op, u, v in random_operations(rng, model, 3000, queries=2):
+            if op is not None:
+                apply_change(forest, op, u, v)
+                continue
+
+            if rng.randrange(2):
+                values[u] = rng.randrange(100)
+                nodes[u].lc_set_value(values[u])
+            else:
+                sub = model.subtree(u)
+                self.assertEqual(
+                    nodes[u].lc_subtree_aggregate(), sum(values[w] for w in sub)
+                )
+                self.assertEqual(nodes[u].lc_subtree_size(), len(sub))
+                self.assertEqual(
+                    nodes[u].lc_path_aggregate(),
+                    sum(values[w] for w in model.root_path(u)),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()